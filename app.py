@@ -3,22 +3,44 @@
 # 기능 요약
 # - 입력: 엑셀 업로드(시트: 무대/옵션) 또는 표 직접 입력
 # - 조건: 최소 휴식 '무대 수'(0 허용), 최소 휴식 '시간(분)'
-# - 후보안: 우선 '휴식 만족'에서 수집 → 부족하면 '완화'로 보충
-# - 후보안 최대 9개로 캡(속도/안정성)
+# - 후보안: 우선 '휴식 만족'에서 수집 → 부족하면 '완화'(위반 최소화 탐색)로 보충
+# - 휴식 만족 탐색: timetable 엔진(제약 전파 백트래킹, MRV)
+# - 후보안: 유효 배치를 '검토할 배치 수'만큼 훑어 점수 상위 N개(최대 50개), 진행 중 상위 후보를 바로 보여줌
+# - 탐색 예산: 사이드바 '생성 제한 시간(초)' 안에서 끝남(공연 규모와 무관하게 대기 시간 예측 가능)
 # - 시각화: 타임라인(작게), 참가자 히트맵(작게), 휴식 없는 인원 목록
+# - 다듬기(선택): 휴식 만족 후보안을 담금질로 v3 점수 개선
+# - 병렬: 사이드바 '병렬 작업 수'만큼 프로세스로 seed 구간 분산(결과 동일)
+# - 캐시: 같은 입력/조건/seed의 결과 재사용(TIMETABLE_CACHE_PATH 지정 시 sqlite로 재시작 후에도 유지)
+# - 사전 검사: 불가능이 증명되면(참가자 무대 수/고정 무대 충돌 등) 이유 안내 후 바로 완화
+# - 최적 증명: 작은 공연은 비트마스크 DP로 최적해를 구해 ⭐최적 표시(다듬기 대상에서 제외)
+# - 결과 표시: 기본은 선택한 후보안 하나만 그림(fragment), 토글로 전부 탭 표시
+# - 결과 유지: 생성 결과/후보안별 표·차트 데이터를 session_state에 보관(입력이 바뀔 때만 버림)
+# - 진단(선택): 단계별 시도/중복/탈락·가지치기 이유/시간, 위반이 잦은 참가자를 사이드바에 표시
 # - UI: 무작위 변수(랜덤시드), 고대비/큰 글자 토글, 템플릿 다운로드, 결과 엑셀 다운로드
 # - 브랜딩: logo.png 자동 표기, use_container_width 사용(경고 제거)
 
 from typing import List, Dict, Tuple, Optional
 import io
 import os
-import random
 
 import pandas as pd
 import streamlit as st
 import altair as alt
 from PIL import Image
 
+from timetable import Candidate, Problem, compile_problem
+from timetable.analyze import infeasible_reasons
+from timetable.cache import SolveCache, fingerprint
+from timetable.generate import DEFAULT_SAMPLES, DEFAULT_TIME_LIMIT, make_candidates_two_phase, polish_candidates
+from timetable.relax import violation_counts
+from timetable.stats import GenStats, Progress, STOP_DEADLINE, STOP_ENOUGH, STOP_EXHAUSTED, STOP_SATURATED
+from timetable.workbook import normalize_rows_from_df, phase_notes, read_lineup_bytes, write_results
+
+MAX_CANDIDATES = 50      # 사이드바 후보안 개수 상한
+PREVIEW_CANDIDATES = 5   # 생성 중 미리보기 후보 수
+STOP_LABELS = {STOP_ENOUGH: "개수 채움", STOP_DEADLINE: "제한 시간", STOP_SATURATED: "새 후보 가망 없음",
+               STOP_EXHAUSTED: "탐색 완료"}
+
 
 # ========================= 페이지 & 간단 스타일 =========================
 st.set_page_config(page_title="무대 타임테이블 자동 생성기", layout="wide")
@@ -73,268 +95,28 @@ def make_template_bytes() -> bytes:
     return buf.read()
 
 
-def normalize_rows_from_df(df: pd.DataFrame) -> List[Dict]:
-    """DataFrame → 내부 rows 포맷으로 정규화"""
-    rename_map = {}
-    if "name" in df.columns: rename_map["name"] = "이름"
-    if "duration" in df.columns: rename_map["duration"] = "길이(초)"
-    if "performers" in df.columns: rename_map["performers"] = "참가자"
-    if "fixed" in df.columns: rename_map["fixed"] = "고정순서"
-    if rename_map:
-        df = df.rename(columns=rename_map)
-
-    req_cols = {"이름", "길이(초)", "참가자"}
-    missing = req_cols - set(df.columns)
-    if missing:
-        raise ValueError(f"필수 열 누락: {missing}")
-
-    rows: List[Dict] = []
-    for _, r in df.iterrows():
-        name = str(r["이름"]).strip()
-        if not name:
-            continue
-        try:
-            dur = int(float(r["길이(초)"]))
-        except Exception:
-            raise ValueError(f"길이(초)는 숫자여야 합니다: 무대={name}")
-
-        perf_raw = str(r.get("참가자", "")).strip()
-        performers = [p.strip() for p in perf_raw.split(",") if p.strip()] if perf_raw else []
-
-        fx = r.get("고정순서", "")
-        fixed: Optional[int] = None
-        if pd.notna(fx) and str(fx).strip() != "":
-            try:
-                fixed = int(float(fx))
-                if fixed < 1:
-                    raise ValueError
-            except Exception:
-                raise ValueError(f"고정순서는 1 이상의 정수여야 합니다: 무대={name}")
-
-        rows.append({"name": name, "duration": dur, "performers": performers, "fixed": fixed})
-
-    fixed_positions = [x["fixed"] for x in rows if x["fixed"] is not None]
-    if len(fixed_positions) != len(set(fixed_positions)):
-        raise ValueError("고정순서 값이 중복됩니다. 서로 다른 무대가 같은 고정번호를 가질 수 없습니다.")
-    return rows
-
-
 def parse_excel(file) -> Tuple[List[Dict], int, int, int]:
-    """엑셀에서 무대 rows와 옵션값(r, n, rest_seconds) 읽기"""
-    xls = pd.ExcelFile(file)
-    stage_df = pd.read_excel(xls, sheet_name="무대")
-    try:
-        opt_df = pd.read_excel(xls, sheet_name="옵션")
-        opt = dict(zip(opt_df["옵션"].astype(str), opt_df["값"]))
-        r_from_file = int(opt.get("최소휴식무대", 2))
-        n_from_file = int(opt.get("후보안개수", 5))
-        rest_seconds_from_file = int(opt.get("최소휴식초", 0))
-    except Exception:
-        r_from_file, n_from_file, rest_seconds_from_file = 2, 5, 0
-
-    rows = normalize_rows_from_df(stage_df)
-    return rows, r_from_file, n_from_file, rest_seconds_from_file
-
-
-def build_name_to_row(rows: List[Dict]) -> Dict[str, Dict]:
-    return {r["name"]: r for r in rows}
-
-
-def sum_durations_between(slot_names: List[str], name_to_row: Dict[str, Dict], i_prev: int, i_curr: int) -> int:
-    """i_prev 이후부터 i_curr까지 누적 시간(초)"""
-    if i_curr <= i_prev:
-        return 0
-    total = 0
-    for k in range(i_prev + 1, i_curr + 1):
-        total += name_to_row[slot_names[k - 1]]["duration"]
-    return total
-
-
-# ========================= 제약/평가 & 스케줄러 =========================
-def check_constraints(
-    schedule: List[str],
-    rows: List[Dict],
-    r_rest: int,
-    min_rest_seconds: int,
-    enforce_rest: bool,
-) -> bool:
-    """True=통과. enforce_rest=False이면 휴식제약은 무시."""
-    if not enforce_rest:
-        return True
-
-    name_to_row = build_name_to_row(rows)
-    last_pos: Dict[str, int] = {}
-    for i, s in enumerate(schedule):
-        for p in name_to_row[s]["performers"]:
-            if p in last_pos:
-                # 무대 수 기준
-                if (i - last_pos[p]) <= r_rest:
-                    return False
-                # 시간 기준
-                if min_rest_seconds > 0:
-                    gap_seconds = sum_durations_between(schedule, name_to_row, last_pos[p], i)
-                    if gap_seconds < min_rest_seconds:
-                        return False
-            last_pos[p] = i
-    return True
-
-
-def score_schedule(schedule: List[str], rows: List[Dict]) -> float:
-    """간단 점수(낮을수록 좋음): 총 길이 + 근접 재등장 약한 패널티"""
-    name_to_row = build_name_to_row(rows)
-    total = sum(name_to_row[s]["duration"] for s in schedule)
-    last_pos: Dict[str, int] = {}
-    penalty = 0.0
-    for i, s in enumerate(schedule):
-        for p in name_to_row[s]["performers"]:
-            if p in last_pos:
-                penalty += max(0, 3 - (i - last_pos[p])) * 0.1
-            last_pos[p] = i
-    return total + penalty
-
-
-def place_fixed_slots(rows: List[Dict]) -> Tuple[List[Optional[str]], List[str]]:
-    """고정순서 배치, 나머지 목록 반환"""
-    n = len(rows)
-    board: List[Optional[str]] = [None] * n
-    remain: List[str] = []
-    for r in rows:
-        if r["fixed"] is None:
-            remain.append(r["name"])
-        else:
-            pos = r["fixed"] - 1
-            if pos < 0 or pos >= n or board[pos] is not None:
-                raise ValueError(f"고정 배치 오류: 무대={r['name']}, 위치={r['fixed']}")
-            board[pos] = r["name"]
-    return board, remain
-
-
-def fill_board_random(board: List[Optional[str]], remain: List[str], seed: int) -> List[str]:
-    """빈 칸에 remain을 랜덤 채우기"""
-    rnd = random.Random(seed)
-    rem = remain[:]
-    rnd.shuffle(rem)
-    out = board[:]
-    j = 0
-    for i in range(len(out)):
-        if out[i] is None:
-            out[i] = rem[j]
-            j += 1
-    return out  # type: ignore
-
-
-def solve_with_seed(
-    rows: List[Dict],
-    r_rest: int,
-    seed: int,
-    min_rest_seconds: int,
-    enforce_rest: bool,
-    max_tries: int,
-) -> Tuple[bool, Optional[List[str]]]:
-    """주어진 seed부터 max_tries회 시도하여 유효 스케줄 찾기"""
-    board, remain = place_fixed_slots(rows)
-    if len(rows) == 0:
-        return False, None
-
-    for t in range(max_tries):
-        sched = fill_board_random(board, remain, seed + t)
-        if check_constraints(sched, rows, r_rest, min_rest_seconds, enforce_rest=enforce_rest):
-            return True, sched
-    return False, None
-
-
-def make_candidates_one_phase(
-    rows: List[Dict],
-    r_rest: int,
-    num_candidates: int,
-    seed0: int,
-    min_rest_seconds: int,
-    enforce_rest: bool,
-    tries_per_candidate: int,
-) -> List[List[str]]:
-    """한 단계(강제 or 완화)에서 후보안 수집"""
-    found: List[List[str]] = []
-    seen = set()
-    seed = seed0
-    hard_cap = num_candidates * tries_per_candidate
-    while len(found) < num_candidates and (seed - seed0) < hard_cap:
-        ok, sched = solve_with_seed(
-            rows, r_rest, seed, min_rest_seconds,
-            enforce_rest=enforce_rest, max_tries=tries_per_candidate
-        )
-        seed += 1
-        if not ok or sched is None:
-            continue
-        key = tuple(sched)
-        if key in seen:
-            continue
-        seen.add(key)
-        found.append(sched)
-    found.sort(key=lambda s: score_schedule(s, rows))
-    return found
-
-
-def make_candidates_two_phase(
-    rows: List[Dict],
-    r_rest: int,
-    num_candidates: int,
-    seed0: int,
-    min_rest_seconds: int,
-) -> Tuple[List[List[str]], int]:
-    """
-    1차(강제)에서 최대한 수집 → 부족하면 2차(완화)로 부족분 보충.
-    반환: (최종 후보 리스트, 최종 리스트 중 '강제'로 찾은 개수)
-    ※ 결과는 최대 9개로 캡(속도/안정화 목적)
-    """
-    capped_num = min(num_candidates, 9)
-
-    n = max(1, len(rows))
-    strict_tries = min(2400, 90 * n)
-    relax_tries  = min(1800, 60 * n)
-
-    # 1차: 강제
-    strict = make_candidates_one_phase(
-        rows, r_rest, capped_num, seed0, min_rest_seconds,
-        enforce_rest=True, tries_per_candidate=strict_tries
-    )
-    strict_count = len(strict)
-
-    if strict_count >= capped_num:
-        return strict[:capped_num], capped_num
-
-    # 2차: 완화로 부족분 보충 (시드 영역 분리)
-    remaining = capped_num - strict_count
-    relaxed = make_candidates_one_phase(
-        rows, r_rest, remaining, seed0 + 10_000,
-        min_rest_seconds=min_rest_seconds, enforce_rest=False,
-        tries_per_candidate=relax_tries
-    )
-
-    # 중복 없이 합치기
-    seen = set(map(tuple, strict))
-    for sch in relaxed:
-        t = tuple(sch)
-        if t not in seen:
-            strict.append(sch)
-            seen.add(t)
-        if len(strict) == capped_num:
-            break
-
-    return strict[:capped_num], min(strict_count, capped_num)
+    """엑셀에서 무대 rows와 옵션값(r, n, rest_seconds) 읽기 (같은 파일 내용이면 파싱 결과 재사용)"""
+    rows, opt = read_lineup_bytes(file.getvalue())
+    return rows, opt["r_rest"], opt["num_candidates"], opt["min_rest_seconds"]
 
 
 # ========================= 시각화 & 리포트 =========================
-def make_timeline_df(schedule: List[str], name_to_row: Dict[str, Dict]) -> pd.DataFrame:
+def make_timeline_df(
+    schedule: List[str],
+    problem: Problem,
+    starts: Optional[List[int]] = None,
+) -> pd.DataFrame:
+    if starts is None:
+        starts = problem.start_times(problem.ids(schedule))
     data = []
-    t = 0
     for i, s in enumerate(schedule):
-        dur = name_to_row[s]["duration"]
-        data.append({"무대순서": i + 1, "무대": s, "시작(초)": t, "끝(초)": t + dur})
-        t += dur
+        data.append({"무대순서": i + 1, "무대": s, "시작(초)": starts[i], "끝(초)": starts[i + 1]})
     return pd.DataFrame(data)
 
 
-def show_timeline_chart(timeline_df: pd.DataFrame):
+def timeline_chart_spec(timeline_df: pd.DataFrame) -> Dict:
+    """타임라인 Vega-Lite 스펙(데이터 포함) - 후보안 보고서에 캐시해 두고 재사용"""
     chart = alt.Chart(timeline_df).mark_bar().encode(
         x=alt.X('시작(초):Q', title='진행 시간(초)'),
         x2='끝(초):Q',
@@ -343,38 +125,41 @@ def show_timeline_chart(timeline_df: pd.DataFrame):
         tooltip=['무대순서', '무대',
                  alt.Tooltip('시작(초):Q', format=','), alt.Tooltip('끝(초):Q', format=',')]
     ).properties(height=180)
-    st.altair_chart(chart, use_container_width=True)
+    with alt.data_transformers.disable_max_rows():  # st.altair_chart처럼 행 수 제한 없이
+        return chart.to_dict()
+
+
+def show_timeline_chart(timeline_df: pd.DataFrame, spec: Optional[Dict] = None):
+    st.vega_lite_chart(spec or timeline_chart_spec(timeline_df), use_container_width=True)
 
 
 def make_people_heat_df(
     slots: List[str],
-    name_to_row: Dict[str, Dict],
+    problem: Problem,
     r_rest: int,
-    min_rest_seconds: int
+    min_rest_seconds: int,
+    starts: Optional[List[int]] = None,
 ) -> pd.DataFrame:
     rows: List[Dict] = []
-    t = 0
-    starts = []
-    for s in slots:
-        starts.append(t)
-        t += name_to_row[s]["duration"]
-
-    last_pos: Dict[str, int] = {}
-    for i, s in enumerate(slots):
-        perfs = name_to_row[s]["performers"]
-        for p in perfs:
+    order = problem.ids(slots)
+    if starts is None:
+        starts = problem.start_times(order)
+
+    perf_names = problem.performers
+    last_pos = [-1] * len(perf_names)
+    for i, (s, sid) in enumerate(zip(slots, order)):
+        for p in problem.perf_ids[sid]:
             viol_slots = False
             viol_time = False
-            if p in last_pos:
+            if last_pos[p] >= 0:
                 if (i - last_pos[p]) <= r_rest:
                     viol_slots = True
                 if min_rest_seconds > 0:
-                    gap_seconds = sum_durations_between(slots, name_to_row, last_pos[p], i)
-                    if gap_seconds < min_rest_seconds:
+                    if starts[i] - starts[last_pos[p]] < min_rest_seconds:
                         viol_time = True
             rows.append({
                 "무대순서": i + 1,
-                "참가자": str(p),
+                "참가자": str(perf_names[p]),
                 "무대": s,
                 "위반(r)": viol_slots,
                 "위반(시간)": viol_time,
@@ -385,10 +170,8 @@ def make_people_heat_df(
     return pd.DataFrame(rows)
 
 
-def show_people_heatmap_chart(df: pd.DataFrame, high_contrast: bool = False):
-    if df.empty:
-        st.info("참가자 데이터가 없어 히트맵을 표시할 수 없습니다.")
-        return
+def people_heatmap_spec(df: pd.DataFrame, high_contrast: bool = False) -> Dict:
+    """참가자 히트맵 Vega-Lite 스펙(데이터 포함, df가 비어 있지 않을 때)"""
     n_people = df["참가자"].nunique()
     row_h = 18
     chart_h = max(180, n_people * row_h)
@@ -415,7 +198,15 @@ def show_people_heatmap_chart(df: pd.DataFrame, high_contrast: bool = False):
         x='무대순서:O',
         y=alt.Y('참가자:N', sort=alt.SortField(field='참가자', order='ascending')),
     )
-    st.altair_chart((heat + viol + warn_text), use_container_width=True)
+    with alt.data_transformers.disable_max_rows():
+        return (heat + viol + warn_text).to_dict()
+
+
+def show_people_heatmap_chart(df: pd.DataFrame, high_contrast: bool = False, spec: Optional[Dict] = None):
+    if df.empty:
+        st.info("참가자 데이터가 없어 히트맵을 표시할 수 없습니다.")
+        return
+    st.vega_lite_chart(spec or people_heatmap_spec(df, high_contrast), use_container_width=True)
 
 
 def list_no_rest_people(df_heat: pd.DataFrame) -> List[str]:
@@ -424,16 +215,20 @@ def list_no_rest_people(df_heat: pd.DataFrame) -> List[str]:
     return df_heat[df_heat["위반여부"] == "위반"]["참가자"].unique().tolist()
 
 
+@st.cache_resource
+def get_solve_cache() -> SolveCache:
+    """세션/재실행이 함께 쓰는 후보안 캐시 (TIMETABLE_CACHE_PATH가 있으면 sqlite 파일에도 저장)"""
+    return SolveCache(path=os.environ.get("TIMETABLE_CACHE_PATH") or None)
+
+
 @st.cache_data
-def make_result_excel(candidates: List[List[str]], rows_df_key: str) -> bytes:
-    """가벼운 엑셀(후보안 시트만) 생성"""
+def make_result_excel(result_key: str, _rows: List[Dict], schedules: List[List[str]],
+                      strict_count: int, optimal_count: int) -> bytes:
+    """결과 엑셀(요약 + 후보안 시트) 한 번에 생성 (result_key = 입력/조건 지문, rows는 해시하지 않음)"""
     buf = io.BytesIO()
-    with pd.ExcelWriter(buf, engine="openpyxl") as w:
-        for idx, sched in enumerate(candidates, start=1):
-            tdf = pd.DataFrame({"순서": list(range(1, len(sched)+1)), "무대": sched})
-            tdf.to_excel(w, sheet_name=f"후보안_{idx}", index=False)
-    buf.seek(0)
-    return buf.read()
+    write_results(buf, _rows, schedules, summary=True,
+                  notes=phase_notes(len(schedules), strict_count, optimal_count))
+    return buf.getvalue()
 
 
 # ========================= 입력 UI =========================
@@ -513,13 +308,57 @@ with st.sidebar:
     min_rest_minutes = st.number_input("최소 휴식 시간(분)", min_value=0, value=0, step=1)
     min_rest_seconds = int(min_rest_minutes) * 60
 
-    # 후보안 개수(실제 생성은 내부에서 최대 9개로 캡)
-    num_candidates = st.number_input("후보안 개수", min_value=1, max_value=20, value=5, step=1)
+    num_candidates = st.number_input("후보안 개수", min_value=1, max_value=MAX_CANDIDATES, value=5, step=1)
+    samples = st.number_input(
+        "검토할 배치 수", min_value=1, max_value=20000, value=DEFAULT_SAMPLES, step=100,
+        help="휴식 조건을 만족하는 서로 다른 배치를 이만큼 훑어 점수가 좋은 순으로 후보안을 고릅니다. "
+             "제한 시간이 먼저 끝나면 그때까지 본 것 중에서 고릅니다."
+    )
 
-    st.caption("※ 생성 우선순위: 휴식 조건 '만족' 후보안 → 부족하면 '완화' 후보안으로 보충 (최대 9개)")
+    time_limit = st.slider(
+        "생성 제한 시간(초)", min_value=1, max_value=60, value=int(DEFAULT_TIME_LIMIT), step=1,
+        help="탐색량을 이 시간에 맞춰 정하고, 느린 컴퓨터에서도 이 시간 안에 끝냅니다. 어려운 조건이면 늘려 보세요. "
+             "더 찾아도 새 후보안이 나올 가망이 없으면 일찍 끝납니다(같은 값이면 같은 결과)."
+    )
+
+    cpu_count = os.cpu_count() or 1
+    workers = st.number_input(
+        "병렬 작업 수(CPU 코어)", min_value=1, max_value=cpu_count, value=1, step=1,
+        help="2 이상이면 여러 코어에서 나눠 탐색합니다. 같은 무작위 변수면 결과는 동일합니다."
+    )
+
+    polish = st.toggle(
+        "후보안 다듬기(점수 최적화)", value=False,
+        help="휴식 조건을 만족하는 후보안을 담금질로 다듬어 근접 재등장·긴 무대 연속을 줄입니다. "
+             "시간 예산 안에서 돌기 때문에 결과가 조금씩 달라질 수 있습니다."
+    )
+    polish_seconds = st.slider("다듬기 시간(초)", min_value=0.2, max_value=5.0, value=1.0, step=0.2,
+                               disabled=not polish)
+
+    all_tabs = st.toggle(
+        "후보안 전부 탭으로 그리기", value=False,
+        help="끄면 선택한 후보안 하나만 그려서 화면이 가볍습니다(후보안·참가자가 많을 때 권장)."
+    )
+
+    show_diag = st.toggle(
+        "진단 표시", value=False,
+        help="후보안 생성 과정(시도 수, 탈락 이유, 단계별 시간, 위반이 잦은 참가자)을 사이드바에 보여줍니다."
+    )
+
+    st.caption("※ 생성 우선순위: 휴식 조건 '만족' 후보안(점수 상위) → 부족하면 '완화' 후보안으로 보충")
 
 
 # ========================= 후보안 생성 & 표시 =========================
+def show_progress(box, problem: Problem, p: Progress):
+    """생성 중 진행 상황: 검토 수/경과 시간 + 현재 상위 후보 미리보기(앞 PREVIEW_CANDIDATES개)"""
+    with box.container():
+        st.progress(min(1.0, p.seconds / p.time_limit) if p.time_limit > 0 else 1.0,
+                    text=f"검토 {p.examined}개 · 상위 {p.kept}개 유지 · {p.seconds:.1f}초")
+        if p.best:
+            preview = {f"{i+1}위": c.names(problem) for i, c in enumerate(p.best[:PREVIEW_CANDIDATES])}
+            st.dataframe(pd.DataFrame(preview), use_container_width=True, height=180)
+
+
 st.divider()
 col_btn, col_dl = st.columns([1, 1])
 with col_btn:
@@ -528,24 +367,191 @@ with col_btn:
 if gen and not can_generate:
     st.warning("먼저 무대 데이터를 입력하세요.")
 
-candidates: List[List[str]] = []
-strict_count: int = 0
+# 생성 결과는 session_state["result"]에 보관 → 토글/탭/다운로드로 재실행돼도 유지
+# 입력(무대/조건/seed/다듬기)이 바뀌면 버림. 후보안별 표/차트 데이터는 처음 볼 때 한 번만 계산
+result_key = fingerprint(rows, r_rest=int(r_rest), num_candidates=int(num_candidates),
+                         seed0=int(seed0), min_rest_seconds=int(min_rest_seconds),
+                         time_limit=float(time_limit), samples=int(samples),
+                         polish=bool(polish), polish_seconds=float(polish_seconds))
+if st.session_state.get("result", {}).get("key") != result_key:
+    st.session_state.pop("result", None)
 
 if gen and can_generate:
+    st.session_state.pop("result", None)
     try:
-        candidates, strict_count = make_candidates_two_phase(
-            rows, r_rest,
-            num_candidates=num_candidates,  # 내부에서 최대 9개로 캡
-            seed0=seed0,
-            min_rest_seconds=min_rest_seconds
-        )
+        problem = compile_problem(rows)
+        reasons = infeasible_reasons(problem, r_rest, min_rest_seconds)
+        # 같은 입력/조건/seed/제한 시간이면 결과가 같으므로 캐시 사용 (병렬 작업 수는 결과와 무관)
+        solve_cache = get_solve_cache()
+        cache_key = fingerprint(rows, r_rest=int(r_rest), num_candidates=int(num_candidates),
+                                seed0=int(seed0), min_rest_seconds=int(min_rest_seconds),
+                                time_limit=float(time_limit), samples=int(samples))
+        hit = solve_cache.get(cache_key)
+        if hit is not None:
+            candidates = [Candidate(ids) for ids in hit["candidates"]]
+            strict_count = hit["strict_count"]
+            optimal_count = hit["optimal_count"]
+            stats = hit.get("stats")
+            st.caption("같은 조건의 이전 결과를 불러왔습니다(캐시).")
+        else:
+            # 불가능이 증명되면(reasons) 내부에서 1차(강제)는 건너뛰고 바로 완화 후보를 만든다
+            gen_stats = GenStats()
+            progress_box = st.empty()
+            candidates, strict_count, optimal_count = make_candidates_two_phase(
+                problem, r_rest,
+                num_candidates=int(num_candidates),
+                seed0=seed0,
+                min_rest_seconds=min_rest_seconds,
+                workers=int(workers),
+                stats=gen_stats,
+                time_limit=float(time_limit),
+                samples=int(samples),
+                progress=lambda p: show_progress(progress_box, problem, p)
+            )
+            progress_box.empty()
+            stats = gen_stats.to_dict()
+            solve_cache.put(cache_key, {"candidates": [c.to_list() for c in candidates],
+                                        "strict_count": strict_count,
+                                        "optimal_count": optimal_count, "stats": stats})
+        if polish and strict_count > optimal_count:
+            # 최적 증명된 후보는 그대로 두고 나머지 휴식 만족 후보만 다듬기(다듬은 결과는 전체 후보와 중복 검사)
+            candidates = candidates[:]
+            candidates[optimal_count:strict_count] = polish_candidates(
+                problem, candidates[optimal_count:strict_count], r_rest, min_rest_seconds,
+                time_budget=float(polish_seconds), seed=seed0, exclude=candidates
+            )
         if not candidates:
             st.error("조건이 과도하여 후보안을 찾지 못했습니다. 조건을 완화해 보세요.")
+        else:
+            st.session_state["result"] = {
+                "key": result_key,
+                "problem": problem,
+                "candidates": candidates,
+                "strict_count": strict_count,
+                "optimal_count": optimal_count,
+                "reasons": reasons,
+                "stats": stats,  # GenStats.to_dict() (진단 패널용)
+                "reports": {},  # 후보안 번호 → candidate_report 결과
+            }
     except Exception as e:
         st.error(f"후보안 생성 중 오류: {e}")
 
+
+def candidate_report(result: Dict, i: int) -> Dict:
+    """i번 후보안의 표/차트 데이터 (result["reports"]에 한 번만 계산해 둠)"""
+    report = result["reports"].get(i)
+    if report is None:
+        problem: Problem = result["problem"]
+        cand: Candidate = result["candidates"][i]
+        sched = cand.names(problem)
+        order_ids = cand.ids
+        starts = problem.start_times(order_ids)
+        heat_df = make_people_heat_df(sched, problem, r_rest, min_rest_seconds, starts)
+        report = {
+            "order_df": pd.DataFrame({"순서": list(range(1, len(sched)+1)), "무대": sched}),
+            "timeline_df": make_timeline_df(sched, problem, starts),
+            "heat_df": heat_df,
+            "no_rest": list_no_rest_people(heat_df),
+            "violations": (violation_counts(problem, order_ids, r_rest, min_rest_seconds)
+                           if i >= result["strict_count"] else None),
+            "specs": {},  # 차트 이름(+고대비) → Vega-Lite 스펙
+        }
+        result["reports"][i] = report
+    return report
+
+
+def candidate_label(result: Dict, i: int) -> str:
+    return f"후보안 {i+1}" + (" ⭐최적" if i < result["optimal_count"] else "")
+
+
+def show_candidate(result: Dict, i: int):
+    """i번 후보안 순서표/차트 (차트 스펙은 보고서에 캐시)"""
+    report = candidate_report(result, i)
+    high_contrast = st.session_state.get("high_contrast", False)
+    specs = report["specs"]
+    if i < result["optimal_count"]:
+        st.caption("⭐ 최적 증명됨 — 휴식 조건을 만족하는 배치 중 점수(총 길이 + 근접 재등장 패널티)가 가장 낮고, "
+                   "같은 점수 중 v3 점수(참가자 분산·길이 균형)가 가장 높습니다.")
+    st.markdown("#### 순서")
+    st.dataframe(report["order_df"], use_container_width=True)
+
+    if report["violations"] is not None:
+        w, t = report["violations"]
+        st.caption(f"완화 후보안 — 휴식 위반: 무대 수 {w}건, 휴식 시간 {t}건")
+
+    st.markdown("#### 타임라인 (작게)")
+    if "timeline" not in specs:
+        specs["timeline"] = timeline_chart_spec(report["timeline_df"])
+    show_timeline_chart(report["timeline_df"], spec=specs["timeline"])
+
+    st.markdown("#### 참가자 히트맵 (작게)")
+    heat_df = report["heat_df"]
+    heat_key = ("heat", high_contrast)
+    if heat_key not in specs and not heat_df.empty:
+        specs[heat_key] = people_heatmap_spec(heat_df, high_contrast)
+    show_people_heatmap_chart(heat_df, high_contrast=high_contrast, spec=specs.get(heat_key))
+
+    st.markdown("#### 휴식 없는 인원")
+    bad = report["no_rest"]
+    st.write(", ".join(bad) if bad else "없음 ✅")
+
+
+@st.fragment
+def show_selected_candidate():
+    """선택한 후보안 하나만 그림. 선택을 바꾸면 이 부분만 다시 실행"""
+    result = st.session_state.get("result")
+    if not result:
+        return
+    i = st.selectbox("후보안 선택", range(len(result["candidates"])),
+                     format_func=lambda k: candidate_label(result, k), key="candidate_pick")
+    show_candidate(result, i)
+
+
+def show_diagnostics(stats: Optional[Dict]):
+    """사이드바 진단 패널: 단계별 카운터/시간, 정확해 상태, 위반이 잦은 참가자"""
+    with st.sidebar:
+        st.divider()
+        st.subheader("진단")
+        if not stats:
+            st.caption("진단 정보가 없습니다.")
+            return
+        phase_rows = []
+        for key, label in (("strict", "1차(강제)"), ("relaxed", "2차(완화)")):
+            ph = stats[key]
+            phase_rows.append({
+                "단계": label, "시간(초)": round(ph["seconds"], 3),
+                "시도": ph["attempts"], "성공": ph["solved"], "중복": ph["duplicates"],
+                "검토(서로 다른 배치)": ph["examined"],
+                "배치 샘플": ph["batch_samples"], "배치 유효": ph["batch_valid"],
+                "탈락(무대 수)": ph["reject_window"], "탈락(휴식 시간)": ph["reject_seconds"],
+                "탐색 노드": ph["nodes"], "재시작": ph["restarts"],
+                "가지치기(무대 수)": ph["prune_window"], "가지치기(휴식 시간)": ph["prune_seconds"],
+                "멈춘 이유": STOP_LABELS.get(ph["stop"], "-"),
+            })
+        # 행/열을 바꾸면 한 열에 숫자와 '멈춘 이유' 문자열이 섞임 → Arrow 변환이 되도록 문자열로
+        st.dataframe(pd.DataFrame(phase_rows).set_index("단계").T.astype(str), use_container_width=True)
+        st.caption(f"전체 {stats['total_seconds']:.3f}초 / 제한 {stats['time_limit']:.0f}초 · 정확해: {stats['exact_status'] or '실행 안 함'}"
+                   + (f" ({stats['exact_seconds']:.3f}초)" if stats["exact_status"] else ""))
+        top = sorted(stats["performers"].items(), key=lambda x: (-x[1], x[0]))[:10]
+        if top:
+            st.markdown("**휴식 위반이 잦은 참가자(표본 추정)**")
+            st.dataframe(pd.DataFrame(top, columns=["참가자", "횟수"]), hide_index=True,
+                         use_container_width=True)
+            st.caption("무작위 배치 중 탈락한 일부(최대 64개)와 완화 후보안의 위반만 센 추정치입니다. "
+                       "탐색 엔진의 가지치기는 포함하지 않습니다.")
+
+
 # --- 결과 표시 ---
-if candidates:
+result = st.session_state.get("result")
+if result and show_diag:
+    show_diagnostics(result["stats"])
+if result:
+    candidates = result["candidates"]
+    strict_count = result["strict_count"]
+    if result["reasons"]:
+        st.warning("휴식 조건을 만족하는 배치가 불가능합니다:\n\n" +
+                   "\n".join(f"- {x}" for x in result["reasons"]))
+
     actual = len(candidates)
     if strict_count == actual:
         label = "휴식 조건 ‘만족’ (전부)"
@@ -556,40 +562,28 @@ if candidates:
 
     st.success(f"후보안 {actual}개 생성됨 — {label}")
 
-    # 요청 수보다 적게 나온 경우 안내 (예: 내부 캡 9개)
-    if actual < min(num_candidates, 9):
+    # 요청 수보다 적게 나온 경우 안내
+    if actual < num_candidates:
         st.caption(f"요청 {num_candidates}개 중 {actual}개만 생성되었습니다. "
-                   "조합이 어려워 자동 탐색 예산 내에서 더 찾지 못했습니다.")
+                   "조합이 어려워 제한 시간 안에 더 찾지 못했습니다(사이드바에서 늘릴 수 있음).")
 
     # 결과 엑셀 다운로드 (경량)
-    rows_df_key = pd.DataFrame(rows).to_json(orient="split") if rows else "empty"
     with col_dl:
         st.download_button(
             "결과 엑셀 다운로드",
-            data=make_result_excel(candidates, rows_df_key),
+            data=make_result_excel(result["key"], rows, [c.names(result["problem"]) for c in candidates],
+                                   strict_count, result["optimal_count"]),
             file_name="타임테이블_후보안.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True
         )
 
-    name_to_row = build_name_to_row(rows)
-    tabs = st.tabs([f"후보안 {i+1}" for i in range(len(candidates))])
-    for i, (tab, sched) in enumerate(zip(tabs, candidates)):
-        with tab:
-            st.markdown("#### 순서")
-            order_df = pd.DataFrame({"순서": list(range(1, len(sched)+1)), "무대": sched})
-            st.dataframe(order_df, use_container_width=True)
-
-            st.markdown("#### 타임라인 (작게)")
-            tdf = make_timeline_df(sched, name_to_row)
-            show_timeline_chart(tdf)
-
-            st.markdown("#### 참가자 히트맵 (작게)")
-            heat_df = make_people_heat_df(sched, name_to_row, r_rest, min_rest_seconds)
-            show_people_heatmap_chart(heat_df, high_contrast=st.session_state.get("high_contrast", False))
-
-            st.markdown("#### 휴식 없는 인원")
-            bad = list_no_rest_people(heat_df)
-            st.write(", ".join(bad) if bad else "없음 ✅")
+    if all_tabs:
+        tabs = st.tabs([candidate_label(result, i) for i in range(len(candidates))])
+        for i, tab in enumerate(tabs):
+            with tab:
+                show_candidate(result, i)
+    else:
+        show_selected_candidate()
 
 st.caption("ⓒ TimetableApp — '무작위 변수' 값이 같으면 결과가 재현됩니다.")
@@ -0,0 +1,262 @@
+# benchmark.py - 가상 라인업 생성기 + 엔진 벤치마크
+# ------------------------------------------------
+# - make_lineup: 무대 수/참가자 풀/겹침 정도/고정 비율로 rows 생성(seed로 재현)
+# - 엔진별 측정(인스턴스마다)
+#   · v1_solve       : solve(seed 없음, 입력 순서) - scheduler_v1
+#   · solve_with_seed: seed별 제약 전파 탐색 - scheduler_v2/v3, app 1차 단계
+#   · two_phase      : make_candidates_two_phase (앱 후보안 생성 전체)
+#   · exact          : 비트마스크 DP (상태 수 추정 exact.estimated_states가 EXACT_MAX_STATES 이하일 때만)
+# - 기록: 첫 유효해까지 시간, 초당 후보 수, 성공률, 최대 메모리(tracemalloc, 별도 실행)
+#   · two_phase 초당 후보 수: samples=THROUGHPUT_SAMPLES로 훑게 하고 1차에서 채점한 서로 다른 해 수
+#     (GenStats.strict.examined) / 1차 시간
+#   · two_phase 첫 유효해: 후보 1개만 찾는 실행(samples=1)을 따로 재서 기록(본 실행에서 찾았을 때만)
+#   · two_phase 메모리: 제한 시간을 MEMORY_TIME_LIMIT초로 줄인 실행(전체 제한 시간을 한 번 더 쓰지 않음)
+#   엔진마다 새 프로세스에서 돌리고 --timeout 초를 넘기면 timed_out으로 기록(큰 공연에서 멈추는 지점)
+# - 결과는 JSON 파일 → --compare 이전결과.json 으로 시간 비교
+#
+# 사용 예)
+#   python benchmark.py --quick
+#   python benchmark.py --sizes 20 50 100 200 500 --out bench_results.json
+#   python benchmark.py --compare bench_old.json
+
+from typing import List, Dict, Callable, Optional, Tuple
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import time
+import tracemalloc
+
+from timetable import compile_problem, solve
+from timetable.exact import EXACT_MAX_STATES, OPTIMAL, estimated_states, solve_exact
+from timetable.generate import DEFAULT_TIME_LIMIT, make_candidates_two_phase, solve_with_seed
+from timetable.stats import GenStats
+
+DEFAULT_SIZES = [20, 50, 100, 200, 500]
+QUICK_SIZES = [20, 50]
+THROUGHPUT_SAMPLES = 100_000  # two_phase 본 실행에서 훑을 해 수(제한 시간 안에서 최대한 → 처리량 측정)
+MEMORY_TIME_LIMIT = 1.0  # two_phase 메모리 측정 실행의 제한 시간(초)
+
+
+def make_lineup(
+    n_stages: int,
+    n_performers: int,
+    per_stage: Tuple[int, int] = (1, 4),
+    overlap: float = 0.5,
+    fixed_ratio: float = 0.0,
+    seed: int = 0,
+) -> List[Dict]:
+    """가상 라인업 rows. overlap이 클수록 일부 참가자에게 무대가 몰림(0=균등)"""
+    if n_stages < 1 or n_performers < 1:
+        raise ValueError("무대 수와 참가자 수는 1 이상이어야 합니다.")
+    rnd = random.Random(seed)
+    pool = [f"참가자{p:03d}" for p in range(n_performers)]
+    weights = [1.0 / (p + 1) ** overlap for p in range(n_performers)]
+    lo, hi = per_stage
+    hi = min(hi, n_performers)
+
+    positions = list(range(1, n_stages + 1))
+    rnd.shuffle(positions)
+    n_fixed = int(round(n_stages * fixed_ratio))
+
+    rows: List[Dict] = []
+    for k in range(n_stages):
+        want = rnd.randint(min(lo, hi), hi)
+        perfs: List[str] = []
+        while len(perfs) < want:
+            p = rnd.choices(pool, weights)[0]
+            if p not in perfs:
+                perfs.append(p)
+        rows.append({
+            "name": f"무대{k + 1:03d}",
+            "duration": rnd.randint(60, 300),
+            "performers": perfs,
+            "fixed": positions[k] if k < n_fixed else None,
+        })
+    return rows
+
+
+def _peak_kib(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run_engine(spec: Dict, engine: str, repeat: int, memory: bool) -> Dict:
+    """엔진 하나 측정(자식 프로세스에서 실행) → 지표 dict"""
+    rows = make_lineup(spec["n_stages"], spec["n_performers"], overlap=spec["overlap"],
+                       fixed_ratio=spec["fixed_ratio"], seed=spec["seed"])
+    r, rest = spec["r_rest"], spec["min_rest_seconds"]
+    max_tries = min(2400, 90 * len(rows))
+
+    t = time.perf_counter()
+    problem = compile_problem(rows)
+    m: Dict = {"compile_s": time.perf_counter() - t}
+
+    if engine == "v1_solve":
+        call = lambda: solve(problem, r, rest, max_nodes=max_tries)
+        t = time.perf_counter()
+        ok, _ = call()
+        dt = time.perf_counter() - t
+        m.update(seconds=dt, first_feasible_s=dt if ok else None, success_rate=float(ok))
+    elif engine == "solve_with_seed":
+        call = lambda: solve_with_seed(problem, r, 0, rest, True, max_tries)
+        times: List[float] = []
+        first: Optional[float] = None
+        wins = 0
+        start = time.perf_counter()
+        for seed in range(repeat):
+            t = time.perf_counter()
+            ok, _ = solve_with_seed(problem, r, seed, rest, True, max_tries)
+            times.append(time.perf_counter() - t)
+            if ok:
+                wins += 1
+                if first is None:
+                    first = time.perf_counter() - start
+        times.sort()
+        m.update(seconds=sum(times), median_s=times[len(times) // 2],
+                 first_feasible_s=first, success_rate=wins / repeat)
+    elif engine == "two_phase":
+        stats = GenStats()
+        t = time.perf_counter()
+        cands, strict_count, optimal_count = make_candidates_two_phase(problem, r, 9, 0, rest,
+                                                                       time_limit=spec["time_limit"],
+                                                                       samples=THROUGHPUT_SAMPLES, stats=stats)
+        dt = time.perf_counter() - t
+        ph = stats.strict
+        first = None
+        if strict_count:
+            t = time.perf_counter()
+            _, found, _ = make_candidates_two_phase(problem, r, 1, 0, rest, exact=False,
+                                                    time_limit=spec["time_limit"], samples=1)
+            first = time.perf_counter() - t if found else None
+        m.update(seconds=dt, first_feasible_s=first, candidates=len(cands), strict=strict_count,
+                 optimal=optimal_count, examined=ph.examined,
+                 candidates_per_s=ph.examined / ph.seconds if ph.seconds > 0 else None,
+                 success_rate=float(strict_count > 0))
+        limit = min(spec["time_limit"], MEMORY_TIME_LIMIT)
+        call = lambda: make_candidates_two_phase(problem, r, 9, 0, rest, time_limit=limit)
+        m["peak_time_limit"] = limit
+    elif engine == "exact":
+        call = lambda: solve_exact(problem, r, rest)
+        t = time.perf_counter()
+        status, _ = call()
+        dt = time.perf_counter() - t
+        m.update(seconds=dt, status=status, first_feasible_s=dt if status == OPTIMAL else None,
+                 success_rate=float(status == OPTIMAL))
+    else:
+        raise ValueError(f"알 수 없는 엔진: {engine}")
+
+    if memory:
+        m["peak_kib"] = _peak_kib(call)
+    return m
+
+
+def bench_instance(spec: Dict, repeat: int, memory: bool, timeout: float) -> List[Dict]:
+    """인스턴스 하나에 대해 엔진별 측정 레코드. 엔진마다 새 프로세스, timeout 초 넘으면 중단"""
+    engines = ["v1_solve", "solve_with_seed", "two_phase"]
+    n_fixed = int(round(spec["n_stages"] * spec["fixed_ratio"]))
+    if estimated_states(spec["n_stages"] - n_fixed) <= EXACT_MAX_STATES:  # solve_exact가 바로 포기하지 않는 크기
+        engines.append("exact")
+
+    out: List[Dict] = []
+    ctx = multiprocessing.get_context("spawn")
+    for engine in engines:
+        pool = ctx.Pool(1)
+        try:
+            m = pool.apply_async(run_engine, (spec, engine, repeat, memory)).get(timeout)
+            m["timed_out"] = False
+        except multiprocessing.TimeoutError:
+            m = {"seconds": None, "success_rate": 0.0, "timed_out": True}
+        finally:
+            pool.terminate()
+            pool.join()
+        out.append({**spec, "engine": engine, **m})
+    return out
+
+
+def instance_grid(sizes: List[int], args) -> List[Dict]:
+    grid = []
+    for n in sizes:
+        for r in args.r:
+            for rest in args.rest:
+                grid.append({
+                    "n_stages": n,
+                    "n_performers": max(2, int(n * args.performer_ratio)),
+                    "overlap": args.overlap,
+                    "fixed_ratio": args.fixed_ratio,
+                    "r_rest": r,
+                    "min_rest_seconds": rest,
+                    "seed": args.seed,
+                    "time_limit": args.time_limit,
+                })
+    return grid
+
+
+def _key(rec: Dict) -> Tuple:
+    return (rec["engine"], rec["n_stages"], rec["n_performers"], rec["overlap"],
+            rec["fixed_ratio"], rec["r_rest"], rec["min_rest_seconds"], rec["seed"])
+
+
+def compare(old_path: str, new: List[Dict]) -> None:
+    """같은 (엔진, 인스턴스) 기준 시간 비교 출력"""
+    with open(old_path, encoding="utf-8") as f:
+        old = {_key(x): x for x in json.load(f)["results"]}
+    print(f"\n=== 비교: {old_path} → 이번 실행 ===")
+    for rec in new:
+        prev = old.get(_key(rec))
+        if prev is None or not prev.get("seconds") or rec["seconds"] is None:
+            continue
+        ratio = rec["seconds"] / prev["seconds"]
+        print(f"{rec['engine']:<16} n={rec['n_stages']:<4} r={rec['r_rest']} rest={rec['min_rest_seconds']:<4} "
+              f"{prev['seconds']:.3f}s → {rec['seconds']:.3f}s (x{ratio:.2f})")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="타임테이블 엔진 벤치마크")
+    ap.add_argument("--sizes", type=int, nargs="+", default=None, help="무대 수 목록")
+    ap.add_argument("--quick", action="store_true", help=f"작은 크기만({QUICK_SIZES})")
+    ap.add_argument("--r", type=int, nargs="+", default=[1, 2], help="최소 휴식 무대 수 목록")
+    ap.add_argument("--rest", type=int, nargs="+", default=[0, 600], help="최소 휴식 초 목록")
+    ap.add_argument("--performer-ratio", type=float, default=1.0, help="참가자 풀 = 무대 수 × 비율")
+    ap.add_argument("--overlap", type=float, default=0.5, help="참가자 쏠림 정도(0=균등)")
+    ap.add_argument("--fixed-ratio", type=float, default=0.05, help="고정 무대 비율")
+    ap.add_argument("--repeat", type=int, default=10, help="seed 탐색 반복 수")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT, help="two_phase 생성 제한 시간(초)")
+    ap.add_argument("--timeout", type=float, default=60.0, help="엔진 1회 측정 제한(초)")
+    ap.add_argument("--no-memory", action="store_true", help="최대 메모리 측정 생략(빠름)")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", default=None, help="이전 결과 JSON과 시간 비교")
+    args = ap.parse_args()
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    results: List[Dict] = []
+    for spec in instance_grid(sizes, args):
+        recs = bench_instance(spec, args.repeat, memory=not args.no_memory, timeout=args.timeout)
+        for rec in recs:
+            took = "시간 초과" if rec["timed_out"] else f"{rec['seconds']:.3f}s"
+            print(f"{rec['engine']:<16} n={rec['n_stages']:<4} r={rec['r_rest']} rest={rec['min_rest_seconds']:<4} "
+                  f"{took} 성공률={rec['success_rate']:.2f}")
+        results.extend(recs)
+
+    meta = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": vars(args),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=1)
+    print(f"✅ 저장 완료: {args.out} ({len(results)}건)")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
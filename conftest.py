@@ -0,0 +1,10 @@
+def random_rows(rnd, n, n_perf, fixed_ratio=0.0, max_perf=3):
+    """테스트용 무작위 라인업 rows(무대마다 참가자 1~max_perf명, fixed_ratio 비율로 고정 순서)"""
+    rows = []
+    positions = rnd.sample(range(1, n + 1), n)
+    for k in range(n):
+        perfs = rnd.sample([f"P{p}" for p in range(n_perf)], rnd.randint(1, min(max_perf, n_perf)))
+        rows.append({"name": f"S{k}", "duration": rnd.choice([90, 150, 200, 260]),
+                     "performers": perfs,
+                     "fixed": positions[k] if rnd.random() < fixed_ratio else None})
+    return rows
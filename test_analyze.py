@@ -0,0 +1,30 @@
+import itertools
+import random
+
+from conftest import random_rows
+from timetable import compile_problem
+from timetable.analyze import infeasible_reasons
+
+
+def test_never_rejects_a_feasible_instance():
+    rnd = random.Random(13)
+    proved = 0
+    for case in range(60):
+        n = rnd.randint(2, 7)
+        problem = compile_problem(random_rows(rnd, n, rnd.randint(2, 5), fixed_ratio=0.3))
+        for r_rest, rest in [(1, 0), (2, 0), (3, 0), (1, 300), (2, 600)]:
+            feasible = any(all(f < 0 or f == s for f, s in zip(problem.board, o))
+                           and problem.feasible(list(o), r_rest, rest)
+                           for o in itertools.permutations(range(n)))
+            reasons = infeasible_reasons(problem, r_rest, rest)
+            if feasible:
+                assert reasons == []
+            proved += bool(reasons)
+    assert proved  # 불가능 사례도 실제로 걸러냄
+
+
+def test_too_many_stages_for_one_performer():
+    rows = [{"name": f"S{k}", "duration": 60, "performers": ["X"] if k < 3 else ["Y"], "fixed": None}
+            for k in range(4)]
+    reasons = infeasible_reasons(compile_problem(rows), 2, 0)
+    assert len(reasons) == 1 and "'X'" in reasons[0]
@@ -0,0 +1,27 @@
+import itertools
+import random
+
+import numpy as np
+
+from conftest import random_rows
+from timetable import batch, compile_problem
+
+
+def test_valid_mask_matches_feasible():
+    rnd = random.Random(11)
+    for case in range(30):
+        n = rnd.randint(1, 7)
+        problem = compile_problem(random_rows(rnd, n, rnd.randint(2, 6), fixed_ratio=0.2))
+        orders = np.array([o for o in itertools.permutations(range(n))
+                           if all(f < 0 or f == s for f, s in zip(problem.board, o))], dtype=np.int64)
+        for r_rest, rest in [(0, 0), (1, 0), (2, 0), (1, 300), (0, 500)]:
+            got = batch.valid_mask(problem, orders, r_rest, rest).tolist()
+            assert got == [problem.feasible(o, r_rest, rest) for o in orders.tolist()]
+
+
+def test_sampled_orders_keep_fixed_slots():
+    problem = compile_problem(random_rows(random.Random(2), 12, 8, fixed_ratio=0.3))
+    orders = batch.sample_orders(problem, 200, np.random.default_rng(0))
+    for o in orders.tolist():
+        assert sorted(o) == list(range(12))
+        assert all(f < 0 or f == s for f, s in zip(problem.board, o))
@@ -0,0 +1,13 @@
+from timetable.cache import SolveCache, fingerprint
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    rows = [{"name": "A", "duration": 60, "performers": ["X"], "fixed": None}]
+    key = fingerprint(rows, r_rest=1)
+    assert key != fingerprint(rows, r_rest=2)
+    SolveCache(path=path).put(key, {"candidates": [[0]]})
+    again = SolveCache(path=path)
+    assert again.get(key) == {"candidates": [[0]]}
+    again.clear()
+    assert SolveCache(path=path).get(key) is None
@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from timetable.cli import main
+from timetable import workbook
+from timetable.workbook import phase_notes, read_lineup, read_lineup_bytes, write_results
+
+
+def write_lineup(path, n, option_col="옵션"):
+    stages = pd.DataFrame({
+        "이름": [f"무대{k}" for k in range(n)],
+        "길이(초)": [120 + 10 * k for k in range(n)],
+        "참가자": [f"P{k % 3}, P{(k + 1) % 5}" for k in range(n)],
+        "고정순서": ["" if k else 1 for k in range(n)],
+    })
+    options = pd.DataFrame({option_col: ["최소휴식슬롯", "후보안개수"], "값": [1, 3]})
+    with pd.ExcelWriter(path, engine="openpyxl") as w:
+        stages.to_excel(w, sheet_name="무대", index=False)
+        options.to_excel(w, sheet_name="옵션", index=False)
+
+
+def test_reads_both_option_sheet_formats(tmp_path):
+    for col in ["옵션", "옵션명"]:
+        path = tmp_path / f"{col}.xlsx"
+        write_lineup(path, 4, option_col=col)
+        rows, options = read_lineup(path)
+        assert [x["fixed"] for x in rows] == [1, None, None, None]
+        assert options == {"r_rest": 1, "num_candidates": 3, "min_rest_seconds": 0}
+
+
+def test_missing_options_fall_back_to_given_defaults(tmp_path):
+    path = tmp_path / "a.xlsx"
+    write_lineup(path, 4)  # 쉬는시간(초) 없음
+    _, options = read_lineup(path, {"r_rest": 1, "num_candidates": 5, "min_rest_seconds": 60})
+    assert options == {"r_rest": 1, "num_candidates": 3, "min_rest_seconds": 60}
+    assert read_lineup(path)[1]["min_rest_seconds"] == 0
+
+
+def test_error_rows_count_blank_lines(tmp_path):
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "무대"
+    for r in [["이름", "길이(초)", "참가자"], ["A", 60, "X"], [], ["B", 60, "Y"], ["C", "길게", "Z"]]:
+        ws.append(r)
+    ws.cell(row=9, column=1).number_format = "@"  # 서식만 있는 끝의 빈 행
+    path = tmp_path / "blank.xlsx"
+    wb.save(path)
+    with pytest.raises(ValueError) as e:
+        read_lineup(path)
+    assert str(e.value) == "5행: 길이(초)는 숫자여야 합니다: 무대=C"  # 빈 3행도 셈
+    ws.cell(row=5, column=2).value = 60
+    wb.save(path)
+    assert [x["name"] for x in read_lineup(path)[0]] == ["A", "B", "C"]
+
+
+def test_cli_solves_a_directory_in_parallel(tmp_path):
+    src = tmp_path / "in"
+    src.mkdir()
+    for k in range(3):
+        write_lineup(src / f"블록{k}.xlsx", 6 + k)
+    (src / "~$블록0.xlsx").write_bytes(b"")
+    out = tmp_path / "out"
+    code = main([str(src), "--out-dir", str(out), "--jobs", "2", "--time-limit", "2"])
+    assert code == 0
+    assert sorted(os.listdir(out)) == [f"블록{k}_후보안.xlsx" for k in range(3)]
+    sheets = pd.read_excel(out / "블록2_후보안.xlsx", sheet_name=None)
+    assert list(sheets) == ["요약", "후보안_1", "후보안_2", "후보안_3"]
+    assert list(sheets["요약"]["시트"]) == ["후보안_1", "후보안_2", "후보안_3"]
+    assert sorted(sheets["후보안_1"]["무대"]) == sorted(f"무대{k}" for k in range(8))
+    assert sheets["후보안_1"]["무대"][0] == "무대0"
+
+
+def test_cli_does_not_import_ui_packages(tmp_path):
+    # 실제로 한 파일을 풀고 난 뒤 검사(PIL은 openpyxl이 불러오므로 대상 아님)
+    write_lineup(tmp_path / "a.xlsx", 5)
+    code = ("import sys, timetable.cli; code = timetable.cli.main(sys.argv[1:]); "
+            "print(code, sorted({'streamlit', 'altair'} & set(sys.modules)))")
+    out = subprocess.run([sys.executable, "-c", code, str(tmp_path / "a.xlsx"), "--out-dir", str(tmp_path / "out"),
+                          "--time-limit", "1"], capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "0 []"
+
+
+def test_read_lineup_bytes_caches_by_content(tmp_path, monkeypatch):
+    path = tmp_path / "a.xlsx"
+    write_lineup(path, 5)
+    data = path.read_bytes()
+    first = read_lineup_bytes(data)
+    first[0][0]["performers"].append("바뀜")
+    calls = []
+    monkeypatch.setattr(workbook, "read_lineup", lambda src: calls.append(src))
+    assert read_lineup_bytes(data) == read_lineup(path)
+    assert calls == []
+
+
+def test_write_results_streams_all_sheets_in_one_file(tmp_path):
+    rows = [{"name": f"S{k}", "duration": 60 + k, "performers": ["A", f"P{k}"], "fixed": None} for k in range(4)]
+    schedules = [["S0", "S1", "S2", "S3"], ["S3", "S2", "S1", "S0"]]
+    path = tmp_path / "out.xlsx"
+    write_results(path, rows, schedules, summary=True, notes=phase_notes(2, 1, 0))
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets) == ["요약", "후보안_1", "후보안_2"]
+    assert sheets["요약"].to_dict("list") == {"시트": ["후보안_1", "후보안_2"], "무대 수": [4, 4],
+                                             "총 길이(초)": [246, 246], "구분": ["만족", "완화"]}
+    assert sheets["후보안_2"].iloc[0].tolist() == [1, "S3", 63, "A, P3"]
+    write_results(path, rows, [])  # 후보안이 없어도 빈 요약 시트로 저장됨
+    assert list(pd.read_excel(path, sheet_name=None)) == ["요약"]
@@ -0,0 +1,54 @@
+import random
+
+from conftest import random_rows
+from timetable import compile_problem
+from timetable.anneal import anneal
+from timetable.scoring import (
+    v3_score, app_score, near_repeat_units, v3_scorer, app_scorer, app_score_of,
+)
+
+
+def test_delta_matches_full_scorers():
+    rnd = random.Random(1)
+    for case in range(30):
+        n = rnd.randint(2, 40)
+        problem = compile_problem(random_rows(rnd, n, rnd.randint(2, 15), max_perf=4))
+        order = list(range(n))
+        rnd.shuffle(order)
+        v3 = v3_scorer(problem, order)
+        app = app_scorer(problem, order)
+        assert v3.value == v3_score(problem, order)
+        assert app.value == near_repeat_units(problem, order)
+
+        slots = list(range(n))
+        for _ in range(200):
+            a, b = rnd.sample(range(n), 2)
+            if rnd.random() < 0.5:
+                ch = v3.swap_changes(a, b)
+            else:
+                ch = v3.move_changes(slots, a, b)
+            new = v3.order[:]
+            for i, s in ch.items():
+                new[i] = s
+            assert v3.delta(ch) == v3_score(problem, new) - v3_score(problem, v3.order)
+            assert app.delta(ch) == near_repeat_units(problem, new) - near_repeat_units(problem, app.order)
+            if rnd.random() < 0.5:
+                v3.apply(ch)
+                app.apply(ch)
+                assert v3.order == new == app.order
+                assert v3.value == v3_score(problem, new)
+                assert abs(app_score_of(app) - app_score(problem, new)) < 1e-9
+
+
+def test_anneal_keeps_rest_rule():
+    rnd = random.Random(2)
+    rows = random_rows(rnd, 30, 40, max_perf=4)
+    problem = compile_problem(rows)
+    order = list(range(30))
+    for r in (0, 1):
+        if not problem.feasible(order, r, 0):
+            continue
+        out = anneal(problem, order, r, 0, time_budget=None, max_iters=3000, seed=3)
+        assert sorted(out) == order
+        assert problem.feasible(out, r, 0)
+        assert v3_score(problem, out) >= v3_score(problem, order)
@@ -0,0 +1,72 @@
+import itertools
+import random
+import time
+
+from conftest import random_rows
+from timetable import compile_problem
+from timetable.exact import INFEASIBLE, OPTIMAL, TIMEOUT, TOO_LARGE, solve_exact
+from timetable.generate import make_candidates_two_phase
+from timetable.scoring import rank_key
+from timetable.stats import GenStats
+
+
+def test_matches_brute_force_minimum():
+    rnd = random.Random(7)
+    for case in range(40):
+        n = rnd.randint(1, 7)
+        problem = compile_problem(random_rows(rnd, n, rnd.randint(2, 6), fixed_ratio=0.2))
+        for r_rest, rest in [(0, 0), (1, 0), (2, 0), (1, 300)]:
+            best = min((rank_key(problem, list(o)) for o in itertools.permutations(range(n))
+                        if all(f < 0 or f == s for f, s in zip(problem.board, o))
+                        and problem.feasible(list(o), r_rest, rest)), default=None)
+            status, order = solve_exact(problem, r_rest, rest)
+            if best is None:
+                assert status == INFEASIBLE
+            else:
+                assert status == OPTIMAL and problem.feasible(order, r_rest, rest)
+                assert rank_key(problem, order) == best  # 단위뿐 아니라 v3 점수까지 최적
+
+
+def test_gives_up_before_building_layers():
+    rnd = random.Random(1)
+    problem = compile_problem(random_rows(rnd, 30, 30))
+    t0 = time.perf_counter()
+    assert solve_exact(problem, 0, 0) == (TOO_LARGE, None)
+    assert solve_exact(compile_problem(random_rows(rnd, 8, 8)), 0, 0, deadline=time.time() - 1) == (TIMEOUT, None)
+    assert time.perf_counter() - t0 < 0.1
+
+
+def test_stops_at_deadline_while_building_layers():
+    problem = compile_problem(random_rows(random.Random(2), 10, 10))
+    t0 = time.perf_counter()
+    assert solve_exact(problem, 0, 0, deadline=time.time() + 0.2) == (TIMEOUT, None)
+    assert time.perf_counter() - t0 < 0.5
+
+
+def test_generation_time_limit_covers_exact_step():
+    problem = compile_problem(random_rows(random.Random(2), 10, 10))
+    stats = GenStats()
+    t0 = time.perf_counter()
+    make_candidates_two_phase(problem, 0, 5, 0, 0, time_limit=0.5, stats=stats)
+    assert time.perf_counter() - t0 < 1.0
+    assert stats.exact_status in (None, OPTIMAL, TIMEOUT)
+
+
+def test_optimal_flag_needs_full_rank_key_proof():
+    # r=2면 유효 스케줄의 단위는 늘 0 → 단위만으로는 최적이 아님(DP가 v3까지 증명해야)
+    big = compile_problem(random_rows(random.Random(4), 40, 40))
+    _, strict, optimal = make_candidates_two_phase(big, 2, 5, 0, 0, time_limit=1)
+    assert strict and optimal == 0
+
+    rnd = random.Random(9)
+    checked = 0
+    while checked < 5:
+        problem = compile_problem(random_rows(rnd, 7, 7))
+        keys = [rank_key(problem, list(o)) for o in itertools.permutations(range(7))
+                if problem.feasible(list(o), 2, 0)]
+        if not keys:
+            continue
+        cands, strict, optimal = make_candidates_two_phase(problem, 2, 3, 0, 0, time_limit=1)
+        assert optimal >= 1 and rank_key(problem, cands[0].ids) == min(keys)
+        assert all(rank_key(problem, c.ids) == min(keys) for c in cands[:optimal])
+        checked += 1
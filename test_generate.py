@@ -0,0 +1,68 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import random_rows
+from timetable import compile_problem, generate
+from timetable.stats import STOP_EXHAUSTED, GenStats
+
+
+def _counting_pool(opened):
+    def fake(problem, workers):
+        opened.append(workers)
+        return ThreadPoolExecutor(max_workers=workers, initializer=generate._init_worker, initargs=(problem,))
+    return fake
+
+
+def test_pool_opens_only_for_seed_search(monkeypatch):
+    opened = []
+    monkeypatch.setattr(generate, "open_pool", _counting_pool(opened))
+
+    # 참가자가 전부 달라 배치 샘플링만으로 충분 → 풀을 띄우지 않음
+    easy = compile_problem([{"name": f"S{k}", "duration": 100, "performers": [f"P{k}"], "fixed": None}
+                            for k in range(20)])
+    got, strict, _ = generate.make_candidates_two_phase(easy, 2, 5, 1, 0, workers=2, time_limit=2)
+    assert strict == len(got) == 5 and opened == []
+
+    # 무작위 배치가 거의 통과하지 못함 → seed 탐색에서 처음 한 번만 띄움
+    hard = compile_problem(random_rows(random.Random(5), 30, 30))
+    got, strict, _ = generate.make_candidates_two_phase(hard, 2, 5, 1, 300, workers=2, time_limit=2)
+    assert strict >= 1 and all(hard.feasible(c.ids, 2, 300) for c in got[:strict])
+    assert opened == [2]
+
+
+def test_polish_does_not_duplicate_excluded_candidates(monkeypatch):
+    problem = compile_problem([{"name": f"S{k}", "duration": 100, "performers": [f"P{k}"], "fixed": None}
+                               for k in range(5)])
+    kept, polished = generate.Candidate([0, 1, 2, 3, 4]), generate.Candidate([4, 3, 2, 1, 0])
+    monkeypatch.setattr(generate, "anneal", lambda *args, **kwargs: kept.to_list())
+    assert generate.polish_candidates(problem, [polished], 1, 0, 0.1, 0) == [kept]
+    got = generate.polish_candidates(problem, [polished], 1, 0, 0.1, 0, exclude=[kept, polished])
+    assert got == [polished]
+
+
+def test_same_seed_gives_same_candidates():
+    # 멈춤 판단(작업량 예산, Good–Turing)이 시간이 아니라 작업량 기준 → 실행마다 같은 결과
+    problem = compile_problem(random_rows(random.Random(8), 40, 40))
+    runs = []
+    for _ in range(3):
+        stats = GenStats()
+        got, strict, _ = generate.make_candidates_two_phase(problem, 2, 5, 3, 300, samples=20000,
+                                                            time_limit=1, stats=stats)
+        assert stats.strict.stop == STOP_EXHAUSTED  # 작업량 예산에서 멈춤
+        runs.append(([c.to_list() for c in got], strict, stats.strict.attempts, stats.strict.examined))
+    assert runs[0] == runs[1] == runs[2]
+
+
+def test_workers_give_same_candidates_as_serial(monkeypatch):
+    # 멈춤 판단이 seed 순서의 작업량 기준 → 같은 seed0이면 병렬(프로세스 풀)도 직렬과 같은 리스트
+    # 작업량은 위 테스트(제한 시간 1초)와 같게, 벽시계 안전장치는 넉넉히(프로세스 기동/코어 1개인 기계)
+    monkeypatch.setattr(generate, "WORK_PER_SECOND", generate.WORK_PER_SECOND // 10)
+    problem = compile_problem(random_rows(random.Random(8), 40, 40))
+    runs = []
+    for workers in (1, 2):
+        stats = GenStats()
+        got, strict, _ = generate.make_candidates_two_phase(problem, 2, 5, 3, 300, samples=20000, workers=workers,
+                                                            time_limit=10, stats=stats)
+        assert stats.strict.stop == STOP_EXHAUSTED
+        runs.append(([c.to_list() for c in got], strict, stats.strict.attempts, stats.strict.examined))
+    assert runs[0] == runs[1]
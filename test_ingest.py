@@ -0,0 +1,61 @@
+import random
+
+import pandas as pd
+import pytest
+
+from timetable.ingest import validate_stages
+from timetable.workbook import normalize_rows_from_df
+
+
+def reference_rows(df):
+    """예전 iterrows 정규화(빈 칸 참가자/고정순서 처리 포함)"""
+    rows = []
+    for _, r in df.iterrows():
+        perf = "" if pd.isna(r["참가자"]) else str(r["참가자"])
+        fx = r["고정순서"]
+        rows.append({"name": str(r["이름"]).strip(), "duration": int(float(r["길이(초)"])),
+                     "performers": [p.strip() for p in perf.split(",") if p.strip()],
+                     "fixed": None if pd.isna(fx) or str(fx).strip() == "" else int(float(fx))})
+    return rows
+
+
+def test_matches_row_by_row_normalization():
+    rnd = random.Random(0)
+    n = 300
+    positions = rnd.sample(range(1, n + 1), 20)
+    df = pd.DataFrame({
+        "이름": [f" 무대{k} " for k in range(n)],
+        "길이(초)": [rnd.choice([90, "150", 200.0]) for _ in range(n)],
+        "참가자": [rnd.choice([None, "", " A ,B,, ", "C", "A, D"]) for _ in range(n)],
+        "고정순서": [positions.pop() if rnd.random() < 0.1 and positions else rnd.choice(["", None, " "])
+                     for _ in range(n)],
+    })
+    report = validate_stages(df)
+    assert report.ok
+    assert report.rows == reference_rows(df)
+
+
+def test_reports_every_problem_at_once():
+    df = pd.DataFrame({
+        "이름": ["A", "B", "", "A", "C", "D"],
+        "길이(초)": [60, "길게", 60, 60, 60, 60],
+        "참가자": ["X, Y", "X", "X", "X", None, "Z"],
+        "고정순서": [1, 0, None, 1, 9, 2.5],
+    })
+    report = validate_stages(df)
+    assert report.rows == []
+    got = {(e.row, e.column) for e in report.errors}
+    assert got == {(3, "길이(초)"), (3, "고정순서"), (6, "고정순서"), (7, "고정순서"),
+                   (None, "고정순서"), (None, "이름")}
+    assert [w.column for w in report.warnings] == ["참가자"]  # X: 무대 3개(빈 이름 행 제외)
+    # 점검 스크립트용: 잘못된 길이/고정순서만 None으로 두고 나머지는 그대로
+    assert [(x["name"], x["duration"], x["fixed"]) for x in report.draft] == [
+        ("A", 60, 1), ("B", None, None), ("A", 60, 1), ("C", 60, None), ("D", 60, None)]
+    with pytest.raises(ValueError) as e:
+        normalize_rows_from_df(df)
+    assert len(str(e.value).splitlines()) == len(report.errors)
+
+
+def test_missing_columns():
+    report = validate_stages(pd.DataFrame({"이름": ["A"]}))
+    assert not report.ok and report.errors[0].column == "길이(초), 참가자"
@@ -0,0 +1,39 @@
+import itertools
+import random
+
+from conftest import random_rows
+from timetable import compile_problem, generate
+from timetable.relax import min_violation, violation_penalty
+
+
+def test_penalty_is_zero_exactly_when_feasible():
+    rnd = random.Random(17)
+    for case in range(30):
+        n = rnd.randint(1, 6)
+        problem = compile_problem(random_rows(rnd, n, rnd.randint(2, 5)))
+        for r_rest, rest in [(1, 0), (2, 0), (1, 300)]:
+            for o in itertools.permutations(range(n)):
+                assert (violation_penalty(problem, o, r_rest, rest) == 0) == problem.feasible(list(o), r_rest, rest)
+
+
+def test_min_violation_keeps_fixed_slots_and_reports_its_penalty():
+    rnd = random.Random(19)
+    for case in range(10):
+        problem = compile_problem(random_rows(rnd, 15, 6, fixed_ratio=0.2))
+        free = iter(problem.free)
+        start = [s if s >= 0 else next(free) for s in problem.board]
+        before = violation_penalty(problem, start, 2, 300)
+        best, pen = min_violation(problem, start, 2, 300, max_iters=2000, seed=case)
+        assert pen == violation_penalty(problem, best, 2, 300) <= before
+        assert sorted(best) == list(range(15))
+        assert all(f < 0 or f == s for f, s in zip(problem.board, best))
+
+
+def test_relaxed_phase_is_deterministic():
+    # seed마다 반복 수가 고정 → 같은 seed0이면 완화 후보도 실행마다 같음
+    problem = compile_problem(random_rows(random.Random(23), 12, 3))
+    runs = []
+    for _ in range(2):
+        got, strict, _ = generate.make_candidates_two_phase(problem, 4, 3, 1, 600, time_limit=5)
+        runs.append(([c.to_list() for c in got], strict))
+    assert runs[0][1] < 3 and runs[0] == runs[1]
@@ -0,0 +1,33 @@
+import itertools
+import random
+
+from conftest import random_rows
+from timetable import compile_problem, solve, solve_many
+
+
+def test_enumerates_every_solution_without_backjump():
+    rnd = random.Random(3)
+    for case in range(25):
+        n = rnd.randint(2, 7)
+        problem = compile_problem(random_rows(rnd, n, rnd.randint(2, 8), fixed_ratio=0.2))
+        for r_rest, rest in [(1, 0), (2, 0), (1, 300)]:
+            valid = {o for o in itertools.permutations(range(n))
+                     if all(f < 0 or f == s for f, s in zip(problem.board, o))
+                     and problem.feasible(list(o), r_rest, rest)}
+            got = solve_many(problem, r_rest, rest, k=10_000, seed=case, backjump=0)
+            assert len(got) == len(set(map(tuple, got)))
+            assert set(map(tuple, got)) == valid
+
+
+def test_diverse_solutions_are_feasible_and_far_apart():
+    rnd = random.Random(5)
+    for case in range(10):
+        n = rnd.randint(10, 30)
+        problem = compile_problem(random_rows(rnd, n, n))
+        got = solve_many(problem, 2, 300, k=6, seed=case, min_diff=4)
+        ok, first = solve(problem, 2, 300, seed=case)
+        assert bool(got) == ok and (not ok or got[0] == first)
+        for i, order in enumerate(got):
+            assert problem.feasible(order, 2, 300)
+            for other in got[:i]:
+                assert sum(a != b for a, b in zip(order, other)) >= 4
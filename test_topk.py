@@ -0,0 +1,52 @@
+import itertools
+import pickle
+import random
+
+from timetable import Candidate, compile_problem
+from timetable.generate import make_candidates_two_phase
+from timetable.scoring import rank_key
+from timetable.topk import TopK
+
+
+def test_topk_keeps_lowest_keys_first_come_on_ties():
+    rnd = random.Random(0)
+    for case in range(200):
+        k = rnd.randint(1, 8)
+        items = [((rnd.randint(0, 4),), (i,)) for i in range(rnd.randint(0, 40))]
+        top = TopK(k)
+        for key, order in items:
+            top.push(key, order)
+        expect = sorted(items, key=lambda x: (x[0], x[1]))[:k]
+        assert [(key, tuple(order)) for key, order in top.items()] == expect
+
+
+def test_topk_ignores_duplicates():
+    top = TopK(3)
+    assert top.push((1,), Candidate([0, 1]))
+    assert not top.push((1,), Candidate([0, 1]))
+    assert len(top) == 1
+
+
+def test_strict_phase_returns_true_top_k_when_exhaustive():
+    rnd = random.Random(2)
+    checked = 0
+    while checked < 5:
+        rows = [{"name": f"S{k}", "duration": rnd.choice([90, 150, 200, 260]),
+                 "performers": rnd.sample(["A", "B", "C", "D", "E", "F"], rnd.randint(1, 2)),
+                 "fixed": None} for k in range(6)]
+        problem = compile_problem(rows)
+        valid = [list(o) for o in itertools.permutations(range(6)) if problem.feasible(list(o), 1, 0)]
+        if len(valid) < 30:
+            continue
+        checked += 1
+        cands, strict_count, _ = make_candidates_two_phase(problem, 1, 20, 0, 0, samples=len(valid))
+        assert strict_count == 20
+        expect = sorted(rank_key(problem, o) for o in valid)[:20]
+        assert [rank_key(problem, c.ids) for c in cands] == expect
+
+
+def test_candidate_hash_and_equality_follow_ids():
+    a, b, c = Candidate([2, 0, 1]), Candidate([2, 0, 1]), Candidate([2, 1, 0])
+    assert a == b and hash(a) == hash(b) and a != c
+    assert len({a, b, c}) == 2
+    assert pickle.loads(pickle.dumps(a)) == a and a.to_list() == [2, 0, 1]
@@ -0,0 +1,6 @@
+# timetable - 스케줄링 엔진 (Streamlit 없이 import 가능)
+from .candidate import Candidate
+from .problem import Problem, compile_problem
+from .solver import solve, solve_many
+
+__all__ = ["Candidate", "Problem", "compile_problem", "solve", "solve_many"]
@@ -0,0 +1,4 @@
+# python -m timetable → 명령줄 일괄 생성(cli.py)
+from .cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,89 @@
+# timetable/analyze.py - 탐색 전 불가능 판정(빠른 사전 검사)
+# ------------------------------------------------
+# - 흔한 불가능 사례를 O(n + 참가자 등장 수)로 증명하고 이유를 문장으로 반환
+#   1) 참가자 무대 수 과다: k개 무대를 r칸씩 띄우려면 (k-1)(r+1)+1칸 필요
+#   2) 최소 휴식 초 과다: 첫 등장~마지막 등장 시작 간격 (k-1)×휴식초 > 총 길이 - 최단 무대
+#   3) 고정 무대끼리 충돌: 같은 참가자의 고정 무대가 r칸 안이거나,
+#      사이 칸을 모두 최대 길이로 채워도 휴식 초가 모자람
+#   4) 고정 무대 주변 빈 칸: 앞뒤 r칸 고정 무대와 겹치지 않는 무대가 하나도 없음
+# - 빈 리스트 = 불가능을 증명하지 못함(가능하다는 뜻은 아님)
+
+from bisect import bisect_left, bisect_right
+from typing import List
+
+from .problem import Problem
+
+
+def infeasible_reasons(problem: Problem, r_rest: int, min_rest_seconds: int) -> List[str]:
+    """휴식 조건을 만족하는 스케줄이 없음을 증명하는 이유들(없으면 빈 리스트)"""
+    n = len(problem)
+    if n == 0:
+        return []
+    durs = problem.durations
+    board = problem.board
+    reasons: List[str] = []
+
+    # 참가자별 무대 목록
+    stages_of: List[List[int]] = [[] for _ in problem.performers]
+    for s, ids in enumerate(problem.perf_ids):
+        for p in ids:
+            stages_of[p].append(s)
+    total = sum(durs)
+
+    for p, stages in enumerate(stages_of):
+        k = len(stages)
+        if k < 2:
+            continue
+        name = problem.performers[p]
+        need = (k - 1) * (r_rest + 1) + 1
+        if need > n:
+            reasons.append(f"참가자 '{name}'의 무대 {k}개를 {r_rest}칸씩 띄우려면 "
+                           f"{need}칸이 필요하지만 전체 {n}칸뿐입니다.")
+            continue
+        if min_rest_seconds > 0:
+            span = total - min(durs[s] for s in stages)
+            if (k - 1) * min_rest_seconds > span:
+                reasons.append(f"참가자 '{name}'의 무대 {k}개 사이에 {min_rest_seconds}초씩 쉬려면 "
+                               f"최소 {(k - 1) * min_rest_seconds}초가 필요하지만 가능한 간격은 {span}초뿐입니다.")
+
+    # 고정 무대: 참가자별로 연속한 고정 위치 쌍만 보면 충분
+    free_durs = [durs[s] for s in problem.free]
+    max_dur = max(free_durs) if free_durs else 0
+    upper = [0] * (n + 1)  # upper[i] = 0..i-1 칸 길이 상한 누적합
+    for i, s in enumerate(board):
+        upper[i + 1] = upper[i] + (durs[s] if s >= 0 else max_dur)
+    last_fixed = [-1] * len(problem.performers)
+    for i, s in enumerate(board):
+        if s < 0:
+            continue
+        for p in problem.perf_ids[s]:
+            j = last_fixed[p]
+            last_fixed[p] = i
+            if j < 0:
+                continue
+            name, a, b = problem.performers[p], problem.names[board[j]], problem.names[s]
+            if i - j <= r_rest:
+                reasons.append(f"고정 무대 '{a}'({j + 1}번)와 '{b}'({i + 1}번)에 참가자 '{name}'가 "
+                               f"함께 있어 {r_rest}칸 휴식 조건을 만족할 수 없습니다.")
+            elif min_rest_seconds > 0 and upper[i] - upper[j] < min_rest_seconds:
+                reasons.append(f"고정 무대 '{a}'({j + 1}번)와 '{b}'({i + 1}번) 사이가 최대 "
+                               f"{upper[i] - upper[j]}초라 참가자 '{name}'의 휴식 {min_rest_seconds}초를 "
+                               f"만족할 수 없습니다.")
+
+    # 고정 무대 주변 빈 칸: 창 안 고정 무대들의 충돌 마스크가 남은 무대를 모두 덮음
+    free_mask = 0
+    for s in problem.free:
+        free_mask |= 1 << s
+    if free_mask and r_rest > 0:
+        fixed_pos = [i for i, s in enumerate(board) if s >= 0]
+        if fixed_pos:
+            for i in range(n):
+                if board[i] >= 0:
+                    continue
+                blocked = 0
+                for j in fixed_pos[bisect_left(fixed_pos, i - r_rest):bisect_right(fixed_pos, i + r_rest)]:
+                    blocked |= problem.conflicts[board[j]]
+                if free_mask & ~blocked == 0:
+                    reasons.append(f"{i + 1}번 칸은 앞뒤 {r_rest}칸의 고정 무대와 참가자가 겹치지 않는 "
+                                   f"무대가 없어 채울 수 없습니다.")
+    return reasons
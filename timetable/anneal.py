@@ -0,0 +1,96 @@
+# timetable/anneal.py - 담금질(simulated annealing)로 v3 점수 개선
+# ------------------------------------------------
+# - 시작: 휴식 조건을 만족하는 스케줄
+# - 이웃: 두 슬롯 맞바꾸기(swap) / 한 무대를 다른 위치로 옮기기(move, 사이 무대는 한 칸씩 밀림)
+#   고정 슬롯은 절대 건드리지 않음, 휴식 조건을 깨는 이웃은 버림
+# - 온도: t_start → t_end 기하 감소(시간 예산/반복 한도 중 먼저 닿는 쪽 기준)
+# - 점수는 DeltaScorer로 바뀐 슬롯 주변만 증분 계산 → 수락될 이웃만 휴식 조건 검사
+#   (최소 휴식 초가 없으면 바뀐 슬롯 앞뒤 r칸만 검사)
+
+from typing import List, Dict, Optional, Sequence
+from time import perf_counter
+import math
+import random
+
+from .problem import Problem
+from .scoring import v3_scorer
+
+
+def _window_ok(problem: Problem, cur: List[int], changed: Dict[int, int], r_rest: int) -> bool:
+    """바뀐 슬롯 앞뒤 r칸 안의 충돌만 검사(최소 휴식 초가 없을 때 전체 검사와 동일)"""
+    adj, n = problem.adjacency, len(cur)
+    for i in changed:
+        row = cur[i] * n
+        for j in range(max(0, i - r_rest), min(n, i + r_rest + 1)):
+            if j != i and adj[row + cur[j]]:
+                return False
+    return True
+
+
+def anneal(
+    problem: Problem,
+    order: Sequence[int],
+    r_rest: int,
+    min_rest_seconds: int,
+    time_budget: Optional[float] = 1.0,
+    seed: int = 0,
+    max_iters: Optional[int] = None,
+    t_start: float = 2.0,
+    t_end: float = 0.05,
+) -> List[int]:
+    """order(휴식 조건 만족)에서 시작해 v3 점수가 가장 높았던 스케줄 반환"""
+    cur = list(order)
+    slots = [i for i, s in enumerate(problem.board) if s < 0]
+    m = len(slots)
+    if m < 2 or (time_budget is None and max_iters is None):
+        return cur
+
+    rnd = random.Random(seed)
+    scorer = v3_scorer(problem, cur)
+    cur = scorer.order  # scorer와 같은 리스트를 공유
+    best, best_score = cur[:], scorer.value
+    t0 = perf_counter()
+    temp = t_start
+    it = 0
+    while True:
+        if max_iters is not None and it >= max_iters:
+            break
+        if it & 63 == 0:
+            frac = 0.0
+            if time_budget is not None:
+                elapsed = perf_counter() - t0
+                if elapsed >= time_budget:
+                    break
+                frac = elapsed / time_budget if time_budget > 0 else 1.0
+            if max_iters is not None:
+                frac = max(frac, it / max_iters)
+            temp = t_start * (t_end / t_start) ** frac
+        it += 1
+
+        a, b = rnd.sample(range(m), 2)
+        if rnd.random() < 0.5:
+            changes = scorer.swap_changes(slots[a], slots[b])
+        else:
+            changes = scorer.move_changes(slots, a, b)
+
+        delta = scorer.delta(changes)
+        if delta < 0 and rnd.random() >= math.exp(delta / temp):
+            continue
+
+        # 수락 후보만 휴식 조건 검사
+        old = {i: cur[i] for i in changes}
+        for i, s in changes.items():
+            cur[i] = s
+        if min_rest_seconds > 0:
+            ok = problem.feasible(cur, r_rest, min_rest_seconds)
+        else:
+            ok = _window_ok(problem, cur, changes, r_rest)
+        for i, s in old.items():
+            cur[i] = s
+        if not ok:
+            continue
+
+        scorer.apply(changes)
+        if scorer.value > best_score:
+            best, best_score = cur[:], scorer.value
+    return best
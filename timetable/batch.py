@@ -0,0 +1,131 @@
+# timetable/batch.py - NumPy 배치 샘플링/검증
+# ------------------------------------------------
+# - K개 순열을 (K, n) 정수 행렬로 한 번에 생성(고정 슬롯은 그대로)
+# - 누적합 시작시간 + 무대 충돌 행렬로 r창/최소 휴식 초를 배치 전체에 한 번에 검사
+#   거리 d=1,2,...마다 (K, n-d) 비교 한 번, 이미 탈락한 행은 다음 d에서 제외
+# - numpy가 없으면 available()=False, 호출 측은 기존 경로 사용
+# - counts(dict)를 주면 탈락 이유(reject_window: r칸 / reject_seconds: 휴식 초)별 행 수를 더해 줌
+
+from typing import List, Dict, Iterator, Optional
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy 없는 환경(엔진 단독 사용)
+    np = None
+
+from .problem import Problem
+
+
+def available() -> bool:
+    return np is not None
+
+
+def sample_orders(problem: Problem, k: int, rng) -> "np.ndarray":
+    """고정 슬롯을 유지한 무작위 순열 k개 (k, n)"""
+    n = len(problem)
+    board = np.asarray(problem.board, dtype=np.int64)
+    free_slots = np.flatnonzero(board < 0)
+    free = np.asarray(problem.free, dtype=np.int64)
+    orders = np.tile(board, (k, 1))
+    if len(free):
+        perm = rng.random((k, len(free))).argsort(axis=1)
+        orders[:, free_slots] = free[perm]
+    return orders.reshape(k, n)
+
+
+def valid_mask(
+    problem: Problem,
+    orders: "np.ndarray",
+    r_rest: int,
+    min_rest_seconds: int,
+    counts: Optional[Dict[str, int]] = None,
+) -> "np.ndarray":
+    """각 행(순열)이 휴식 조건을 만족하면 True"""
+    k, n = orders.shape
+    ok = np.ones(k, dtype=bool)
+    if n < 2:
+        return ok
+
+    adj = np.frombuffer(bytes(problem.adjacency), dtype=np.uint8).reshape(n, n).astype(bool)
+    durs = np.asarray(problem.durations, dtype=np.int64)
+
+    # 시간 기준으로 볼 최대 거리: d칸 간격은 최소 d*최소길이초
+    d_max = r_rest
+    starts = None
+    if min_rest_seconds > 0:
+        min_dur = int(durs.min())
+        d_time = n - 1 if min_dur <= 0 else math.ceil(min_rest_seconds / min_dur)
+        d_max = max(d_max, d_time)
+        starts = np.zeros((k, n), dtype=np.int64)
+        np.cumsum(durs[orders[:, :-1]], axis=1, out=starts[:, 1:])
+    d_max = min(d_max, n - 1)
+
+    alive = np.arange(k)
+    for d in range(1, d_max + 1):
+        sub = orders[alive]
+        clash = adj[sub[:, d:], sub[:, :-d]]
+        if d > r_rest:
+            st = starts[alive]
+            clash &= (st[:, d:] - st[:, :-d]) < min_rest_seconds
+        bad = clash.any(axis=1)
+        if bad.any():
+            if counts is not None:
+                key = "reject_window" if d <= r_rest else "reject_seconds"
+                counts[key] = counts.get(key, 0) + int(bad.sum())
+            ok[alive[bad]] = False
+            alive = alive[~bad]
+            if not len(alive):
+                break
+    return ok
+
+
+def iter_valid(
+    problem: Problem,
+    r_rest: int,
+    min_rest_seconds: int,
+    seed: int,
+    max_samples: int,
+    batch_size: int = 4096,
+    limit: Optional[int] = None,
+    stop_on_empty: bool = False,
+    counts: Optional[Dict[str, int]] = None,
+    rejected: Optional[List[List[int]]] = None,
+    max_rejected: int = 64,
+    deadline: Optional[float] = None,
+) -> Iterator[List[int]]:
+    """seed로 정해지는 배치에서 조건을 만족하는 순열을 생성 순서대로 내보냄(중복 가능, 배치 단위로 생성).
+    limit개를 모으면 중단, stop_on_empty면 한 배치에서 하나도 안 나올 때 중단(통과율이 너무 낮음).
+    rejected를 주면 탈락한 순열을 max_rejected개까지 담아 줌(원인 분석용).
+    deadline(time.time() 기준)이 지나면 배치 사이에서 중단"""
+    if np is None or len(problem) == 0:
+        return
+    rng = np.random.default_rng(seed)
+    got = 0
+    done = 0
+    while done < max_samples:
+        k = min(batch_size, max_samples - done)
+        orders = sample_orders(problem, k, rng)
+        mask = valid_mask(problem, orders, r_rest, min_rest_seconds, counts)
+        good = orders[mask].tolist()
+        got += len(good)
+        if rejected is not None and len(rejected) < max_rejected:
+            rejected.extend(orders[~mask][:max_rejected - len(rejected)].tolist())
+        done += k
+        if counts is not None:
+            counts["batch_samples"] = counts.get("batch_samples", 0) + k
+            counts["batch_valid"] = counts.get("batch_valid", 0) + len(good)
+        yield from good
+        if limit is not None and got >= limit:
+            break
+        if stop_on_empty and not good:
+            break
+        if deadline is not None and time.time() > deadline:
+            break
+
+
+def sample_valid(problem: Problem, r_rest: int, min_rest_seconds: int, seed: int, max_samples: int,
+                 **kwargs) -> List[List[int]]:
+    """iter_valid 결과를 리스트로"""
+    return list(iter_valid(problem, r_rest, min_rest_seconds, seed, max_samples, **kwargs))
@@ -0,0 +1,134 @@
+# timetable/cache.py - 후보안 결과 캐시(메모리 LRU + 선택적 디스크)
+# ------------------------------------------------
+# - 키: 정규화한 rows + 파라미터를 정렬된 JSON으로 만든 뒤 sha256 (fingerprint)
+#   rows 순서는 무대 id/seed 결과에 영향을 주므로 그대로 둔다
+# - 메모리: OrderedDict LRU(max_entries), 항목마다 저장 시각 → ttl_seconds 지나면 무효
+# - 디스크(선택): sqlite3 파일 하나, 같은 호스트의 여러 프로세스(Streamlit 워커)가 공유
+#   앱 재시작 후에도 유지, 만료 항목/초과분(max_disk_entries)은 저장할 때 정리
+# - 연결은 호출마다 열고 닫음(with con은 커밋만 하므로 closing으로 감쌈)
+# - 캐시 오류(디스크 잠김/권한 등)는 조용히 무시 → 그냥 다시 계산
+# - 엔진 결과가 바뀌는 수정을 하면 CACHE_VERSION을 올릴 것
+
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+CACHE_VERSION = 9
+
+
+def normalize_rows(rows: List[Dict]) -> List[Dict]:
+    """캐시 키용 rows (입력 순서 유지, 값 타입 통일)"""
+    out = []
+    for x in rows:
+        fx = x.get("fixed")
+        out.append({
+            "name": str(x["name"]),
+            "duration": int(x["duration"]),
+            "performers": [str(p) for p in x["performers"]],
+            "fixed": None if fx is None else int(fx),
+        })
+    return out
+
+
+def fingerprint(rows: List[Dict], **params: Any) -> str:
+    """rows + 파라미터 → 캐시 키(hex)"""
+    payload = {"v": CACHE_VERSION, "rows": normalize_rows(rows), "params": params}
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SolveCache:
+    """fingerprint → JSON 직렬화 가능한 값. 스레드 안전(Streamlit 세션 간 공유)"""
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 6 * 3600,
+        path: Optional[str] = None,
+        max_disk_entries: int = 1024,
+    ):
+        if max_entries < 1 or max_disk_entries < 1:
+            raise ValueError("캐시 크기는 1 이상이어야 합니다.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()  # key → (저장 시각, 값)
+        self._lock = threading.Lock()
+        if path:
+            try:
+                with closing(self._connect()) as con, con:
+                    con.execute("CREATE TABLE IF NOT EXISTS solve_cache "
+                                "(key TEXT PRIMARY KEY, saved_at REAL, value TEXT)")
+            except sqlite3.Error:
+                self.path = None  # 디스크를 못 쓰면 메모리만
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.path, timeout=5)
+        con.execute("PRAGMA journal_mode=WAL")
+        return con
+
+    def _expired(self, saved_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - saved_at > self.ttl_seconds
+
+    def _remember(self, key: str, saved_at: float, value: Any) -> None:
+        with self._lock:
+            self._mem[key] = (saved_at, value)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """있으면 값, 없거나 만료면 None"""
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                if not self._expired(item[0], now):
+                    self._mem.move_to_end(key)
+                    return item[1]
+                del self._mem[key]
+        if not self.path:
+            return None
+        try:
+            with closing(self._connect()) as con, con:
+                row = con.execute("SELECT saved_at, value FROM solve_cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or self._expired(row[0], now):
+            return None
+        value = json.loads(row[1])
+        self._remember(key, row[0], value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        self._remember(key, now, value)
+        if not self.path:
+            return
+        try:
+            with closing(self._connect()) as con, con:
+                con.execute("INSERT OR REPLACE INTO solve_cache (key, saved_at, value) VALUES (?, ?, ?)",
+                            (key, now, json.dumps(value, ensure_ascii=False)))
+                if self.ttl_seconds is not None:
+                    con.execute("DELETE FROM solve_cache WHERE saved_at < ?", (now - self.ttl_seconds,))
+                con.execute("DELETE FROM solve_cache WHERE key NOT IN "
+                            "(SELECT key FROM solve_cache ORDER BY saved_at DESC LIMIT ?)",
+                            (self.max_disk_entries,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+        if self.path:
+            try:
+                with closing(self._connect()) as con, con:
+                    con.execute("DELETE FROM solve_cache")
+            except sqlite3.Error:
+                pass
@@ -0,0 +1,57 @@
+# timetable/candidate.py - 후보안(스케줄) 압축 표현
+# ------------------------------------------------
+# - 슬롯별 무대 id를 array('H')(무대당 2바이트)로 보관 → 이름 문자열 참조 n개 대신 2n바이트
+# - 해시는 만들 때 바이트열로 한 번만 계산해 저장, 같음 비교는 해시 → 배열(바이트) 순
+#   → set/dict 중복 검사가 문자열 n개 해시 대신 정수 비교 한 번
+# - 이름은 화면 표시/엑셀 저장할 때만 names(problem)으로 변환
+# - 무대 수는 65535개까지(array 'H' 범위)
+
+from array import array
+from typing import Iterable, Iterator, List, Sequence
+
+from .problem import Problem
+
+
+class Candidate:
+    """무대 id 순서 하나. 해시 가능(set/dict 키), 불변으로 취급"""
+
+    __slots__ = ("ids", "_hash")
+
+    def __init__(self, order: Iterable[int]):
+        ids = array("H", order)
+        self.ids = ids
+        self._hash = hash(ids.tobytes())
+
+    @classmethod
+    def from_names(cls, problem: Problem, schedule: Sequence[str]) -> "Candidate":
+        return cls(problem.ids(schedule))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __getitem__(self, i: int) -> int:
+        return self.ids[i]
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Candidate):
+            return NotImplemented
+        return self._hash == other._hash and self.ids == other.ids
+
+    def __repr__(self) -> str:
+        return f"Candidate({self.ids.tolist()})"
+
+    def __reduce__(self):
+        return Candidate, (self.ids,)
+
+    def to_list(self) -> List[int]:
+        return self.ids.tolist()
+
+    def names(self, problem: Problem) -> List[str]:
+        """무대 이름 순서(표시/저장용)"""
+        return problem.to_names(self.ids)
@@ -0,0 +1,156 @@
+# timetable/cli.py - 명령줄 일괄 생성 (Streamlit/Altair 없이)
+# ------------------------------------------------
+# - 엑셀 입출력은 openpyxl(import 시 PIL도 불러옴 → PIL은 파일을 읽을 때 함께 로드됨)
+# - 입력: .xlsx 파일 여러 개 또는 폴더(폴더 안 .xlsx 전부, 엑셀 임시 파일 ~$*/이전 결과 파일 제외)
+# - 파일마다 앱과 같은 엔진(make_candidates_two_phase)으로 후보안 생성 → --out-dir에 '<이름>_후보안.xlsx'
+#   입력 파일은 수정하지 않음
+# - 조건: 명령줄 값 > 파일의 옵션 시트 > 기본값(workbook.DEFAULT_OPTIONS)
+# - --jobs개 프로세스에서 파일 단위로 병렬(파일 하나는 한 프로세스에서 직렬 → 같은 seed면 결과 동일)
+# - 파일별 결과 한 줄씩 출력, --summary로 JSON 저장. 실패한 파일이 있으면 종료 코드 1
+#
+# 사용 예)
+#   python -m timetable 리허설1.xlsx 리허설2.xlsx
+#   python -m timetable 라인업폴더/ --jobs 4 --time-limit 30 --out-dir 결과
+
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+import argparse
+import json
+import multiprocessing
+import os
+
+from .analyze import infeasible_reasons
+from .generate import DEFAULT_SAMPLES, DEFAULT_TIME_LIMIT, make_candidates_two_phase
+from .problem import compile_problem
+from .workbook import phase_notes, read_lineup, write_results
+
+DEFAULT_SEED = 12345
+DEFAULT_OUT_DIR = "타임테이블_결과"
+OUTPUT_SUFFIX = "_후보안.xlsx"
+
+
+def find_inputs(paths: List[str]) -> List[str]:
+    """파일/폴더 인자 → .xlsx 경로 목록(입력 순서, 중복 제거). 없는 경로는 ValueError"""
+    out: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = sorted(os.path.join(path, f) for f in os.listdir(path)
+                           if f.lower().endswith(".xlsx") and not f.startswith("~$")
+                           and not f.endswith(OUTPUT_SUFFIX))
+        elif os.path.isfile(path):
+            found = [path]
+        else:
+            raise ValueError(f"파일이나 폴더가 없습니다: {path}")
+        out.extend(f for f in found if f not in out)
+    return out
+
+
+def output_paths(inputs: List[str], out_dir: str) -> List[str]:
+    """입력마다 결과 파일 경로(이름이 겹치면 _2, _3 …)"""
+    used: Dict[str, int] = {}
+    out = []
+    for path in inputs:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        k = used.get(stem, 0) + 1
+        used[stem] = k
+        out.append(os.path.join(out_dir, (stem if k == 1 else f"{stem}_{k}") + OUTPUT_SUFFIX))
+    return out
+
+
+def solve_file(path: str, out_path: str, overrides: Dict[str, Optional[float]]) -> Dict:
+    """파일 하나: 읽기 → 후보안 생성 → 결과 저장. 오류는 예외 대신 결과의 error에 기록"""
+    t0 = perf_counter()
+    summary: Dict = {"input": path, "output": None, "error": None}
+    try:
+        rows, options = read_lineup(path)
+        settings = {"seed": DEFAULT_SEED, "time_limit": DEFAULT_TIME_LIMIT, "samples": DEFAULT_SAMPLES, **options}
+        settings.update({k: v for k, v in overrides.items() if v is not None})
+        if not rows:
+            raise ValueError("무대가 없습니다.")
+        problem = compile_problem(rows)
+        r_rest, rest = int(settings["r_rest"]), int(settings["min_rest_seconds"])
+        reasons = infeasible_reasons(problem, r_rest, rest)
+        candidates, strict_count, optimal_count = make_candidates_two_phase(
+            problem, r_rest,
+            num_candidates=int(settings["num_candidates"]),
+            seed0=int(settings["seed"]),
+            min_rest_seconds=rest,
+            time_limit=float(settings["time_limit"]),
+            samples=int(settings["samples"]),
+        )
+        write_results(out_path, rows, [c.names(problem) for c in candidates], summary=True,
+                      notes=phase_notes(len(candidates), strict_count, optimal_count))
+        summary.update(output=out_path, stages=len(rows), candidates=len(candidates),
+                       strict=strict_count, optimal=optimal_count, reasons=reasons, settings=settings)
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+    summary["seconds"] = round(perf_counter() - t0, 3)
+    return summary
+
+
+def run(inputs: List[str], out_dir: str, overrides: Dict[str, Optional[float]], jobs: int = 1,
+        echo=print) -> List[Dict]:
+    """inputs를 jobs개 프로세스로 나눠 처리, 끝나는 대로 echo로 한 줄씩 알림. 결과는 입력 순서"""
+    os.makedirs(out_dir, exist_ok=True)
+    outs = output_paths(inputs, out_dir)
+    results: List[Optional[Dict]] = [None] * len(inputs)
+    if jobs <= 1 or len(inputs) <= 1:
+        for i, (path, out_path) in enumerate(zip(inputs, outs)):
+            results[i] = solve_file(path, out_path, overrides)
+            echo(format_line(results[i]))
+        return results
+    with ProcessPoolExecutor(max_workers=min(jobs, len(inputs)),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(solve_file, path, out_path, overrides): i
+                   for i, (path, out_path) in enumerate(zip(inputs, outs))}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            results[i] = fut.result()
+            echo(format_line(results[i]))
+    return results
+
+
+def format_line(s: Dict) -> str:
+    if s["error"]:
+        return f"❌ {s['input']}: {s['error']}"
+    mode = "만족" if s["strict"] == s["candidates"] else f"만족 {s['strict']}개 + 완화 {s['candidates'] - s['strict']}개"
+    return (f"✅ {s['input']} → {s['output']} (무대 {s['stages']}개, 후보안 {s['candidates']}개: {mode}, "
+            f"{s['seconds']:.1f}초)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m timetable", description="무대 타임테이블 후보안 일괄 생성")
+    ap.add_argument("inputs", nargs="+", help=".xlsx 파일 또는 폴더")
+    ap.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help=f"결과 폴더 (기본 {DEFAULT_OUT_DIR})")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="동시에 처리할 파일 수(프로세스)")
+    ap.add_argument("--rest-stages", type=int, help="최소 휴식 무대 수 (기본: 옵션 시트)")
+    ap.add_argument("--rest-seconds", type=int, help="최소 휴식 시간(초) (기본: 옵션 시트)")
+    ap.add_argument("--candidates", type=int, help="후보안 개수 (기본: 옵션 시트)")
+    ap.add_argument("--seed", type=int, help=f"무작위 변수 (기본 {DEFAULT_SEED})")
+    ap.add_argument("--time-limit", type=float, help=f"파일당 생성 제한 시간(초) (기본 {DEFAULT_TIME_LIMIT:g})")
+    ap.add_argument("--samples", type=int, help=f"검토할 배치 수 (기본 {DEFAULT_SAMPLES})")
+    ap.add_argument("--summary", help="파일별 결과를 JSON으로 저장할 경로")
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        inputs = find_inputs(args.inputs)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    if not inputs:
+        print("❌ 처리할 .xlsx 파일이 없습니다.")
+        return 2
+    overrides = {"r_rest": args.rest_stages, "min_rest_seconds": args.rest_seconds,
+                 "num_candidates": args.candidates, "seed": args.seed,
+                 "time_limit": args.time_limit, "samples": args.samples}
+    results = run(inputs, args.out_dir, overrides, jobs=args.jobs)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    failed = sum(1 for s in results if s["error"])
+    print(f"완료: {len(results) - failed}/{len(results)}개 파일")
+    return 1 if failed else 0
@@ -0,0 +1,162 @@
+# timetable/exact.py - 비트마스크 DP 정확해(소규모 공연)
+# ------------------------------------------------
+# - 순위 키(scoring.rank_key = (근접 재등장 단위, -v3 점수))의 진짜 최솟값을 휴식 조건 안에서 찾는다
+#   (총 길이는 순서와 무관 → app 점수 최소 = 단위 최소, 같으면 v3 점수 최대)
+#   ※ r ≥ 2이면 휴식 조건상 단위는 늘 0 → 사실상 v3 점수 최대화
+# - 두 점수 모두 '참가자별 직전 등장까지 거리 + 인접 쌍' 항의 합이라 층마다 더해 감
+#   거리 LOOKBACK 이하는 최근 무대에서, 그보다 멀면 '앞에서 나온 적 있는지'(사용 집합의 참가자)만 필요
+# - 상태: (사용한 무대 집합 비트마스크, 최근 무대들 튜플), 슬롯 순서대로 한 층씩 전진
+#   최근 무대는 점수(직전 LOOKBACK개)·r칸 검사·휴식 초 검사에 필요한 만큼만 남김
+#   (r칸 밖이고 그 뒤로 휴식 초가 이미 지난 무대는 잘라내 상태를 합침)
+# - 고정 슬롯은 해당 무대만 배치
+# - upper_bound(이미 찾은 해의 단위 점수)를 주면 단위가 그보다 나쁜 상태는 버림(남은 칸 단위 ≥ 0)
+# - 상태 수가 max_states를 넘으면 포기(TOO_LARGE) → 호출 측은 휴리스틱 사용
+#   시작 전에 estimated_states(사용 집합 × 직전 LOOKBACK개)가 예산을 넘으면 층을 만들지 않고 바로 포기
+# - deadline(time.time() 기준)이 지나면 포기(TIMEOUT), DEADLINE_CHECK개 상태마다 검사
+
+from typing import Dict, List, Optional, Tuple
+import math
+import time
+
+from .problem import Problem, popcount
+from .scoring import BONUS_ALT_LS, LONG_THRESHOLD, NEAR_REPEAT_WINDOW, PENALTY_LONG_LONG, v3_gap_table
+
+EXACT_MAX_STATES = 200_000  # 전체 층 상태 수 상한(메모리 예산, 상태당 수백 바이트)
+DEADLINE_CHECK = 256        # 이만큼 상태를 펼칠 때마다 마감 검사
+
+OPTIMAL = "optimal"        # 최적해 증명
+INFEASIBLE = "infeasible"  # 휴식 조건을 만족하는 스케줄 없음(증명)
+TOO_LARGE = "too_large"    # 상태 공간이 예산 초과
+TIMEOUT = "timeout"        # 마감 시각 초과
+
+LOOKBACK = NEAR_REPEAT_WINDOW + 1  # 점수가 거리에 따라 달라지는 최대 거리(그 너머는 같은 점수)
+UNIT_GAP = [0, 2, 1]               # near_repeat_units의 거리별 단위(거리 1 → 2, 2 → 1)
+
+
+def estimated_states(free_count: int) -> int:
+    """빈 칸 무대 수 → (사용 집합 × 직전 LOOKBACK개 순서) 상태 수 추정(사전 예산 검사용)"""
+    if free_count < LOOKBACK:
+        return math.factorial(free_count) << free_count
+    return math.perm(free_count, LOOKBACK) << (free_count - LOOKBACK)
+
+
+def solve_exact(
+    problem: Problem,
+    r_rest: int,
+    min_rest_seconds: int = 0,
+    max_states: int = EXACT_MAX_STATES,
+    upper_bound: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[str, Optional[List[int]]]:
+    """(상태, 최적 스케줄). 상태가 OPTIMAL일 때만 스케줄(무대 id 순서, rank_key 최소)을 돌려준다.
+    upper_bound가 있으면 단위 점수가 그 이하인 해만 찾음(없으면 INFEASIBLE), deadline이 지나면 TIMEOUT"""
+    n = len(problem)
+    if n == 0:
+        return INFEASIBLE, None
+    if estimated_states(len(problem.free)) > max_states:
+        return TOO_LARGE, None  # 상태 수 추정이 예산 초과 → 층을 만들기 전에 포기
+    if deadline is not None and time.time() >= deadline:
+        return TIMEOUT, None
+
+    durs = problem.durations
+    masks = problem.perf_masks
+    adj = problem.adjacency
+    board = problem.board
+    free = problem.free
+    keep = max(LOOKBACK, r_rest)  # 항상 남길 최근 무대 수
+    gap = v3_gap_table(LOOKBACK + 1)  # v3 거리별 점수(LOOKBACK + 1 = 그보다 먼 거리)
+    long_ = [d >= LONG_THRESHOLD for d in durs]
+    seen_of: Dict[int, int] = {0: 0}  # 사용 집합 → 그 무대들의 참가자 비트마스크
+
+    # 층 k: (사용 집합, 최근 무대 튜플) → ((단위 점수, -v3 점수), 이전 상태 키)
+    layers: List[Dict[Tuple[int, Tuple[int, ...]], Tuple[Tuple[int, int], Optional[tuple]]]] = [
+        {(0, ()): ((0, 0), None)}
+    ]
+    total_states = 1
+    expanded = 0
+    for k in range(n):
+        cur = layers[-1]
+        nxt: Dict[Tuple[int, Tuple[int, ...]], Tuple[Tuple[int, int], Optional[tuple]]] = {}
+        choices = [board[k]] if board[k] >= 0 else free
+        for key, (score, _) in cur.items():
+            expanded += 1
+            if deadline is not None and expanded % DEADLINE_CHECK == 0 and time.time() >= deadline:
+                return TIMEOUT, None
+            used, last = key
+            seen = seen_of[used]
+            for c in choices:
+                if (used >> c) & 1:
+                    continue
+                # 휴식 검사: 뒤에서부터 r칸 또는 휴식 초 안의 무대와 참가자 공유 금지
+                row = c * n
+                elapsed = 0
+                ok = True
+                for j in range(1, len(last) + 1):
+                    prev = last[-j]
+                    elapsed += durs[prev]
+                    if j > r_rest and elapsed >= min_rest_seconds:
+                        break
+                    if adj[row + prev]:
+                        ok = False
+                        break
+                if not ok:
+                    continue
+
+                # 참가자별 직전 등장 거리: 최근 LOOKBACK개 안이면 그 거리, 아니면 앞에 나온 적 있는지
+                m = masks[c]
+                add_units = add_v3 = 0
+                covered = 0
+                for j in range(1, min(len(last), LOOKBACK) + 1):
+                    b = masks[last[-j]]
+                    hit = popcount(m & b & ~covered)
+                    if hit:
+                        add_units += (UNIT_GAP[j] if j < len(UNIT_GAP) else 0) * hit
+                        add_v3 += gap[j] * hit
+                    covered |= b
+                add_v3 += gap[LOOKBACK + 1] * popcount(m & seen & ~covered)
+                if last:
+                    a, b = long_[last[-1]], long_[c]
+                    add_v3 += (-PENALTY_LONG_LONG if a and b else 0) + (BONUS_ALT_LS if a != b else 0)
+
+                # 더 이상 영향을 못 주는 앞쪽 무대 잘라내기
+                new_last = last + (c,)
+                if len(new_last) > keep:
+                    tail = 0
+                    cut = len(new_last)
+                    for j in range(len(new_last) - 1, -1, -1):
+                        tail += durs[new_last[j]]
+                        if len(new_last) - j > keep and tail >= min_rest_seconds:
+                            cut = j
+                            break
+                    if cut < len(new_last):
+                        new_last = new_last[cut + 1:]
+                new_used = used | (1 << c)
+                if new_used not in seen_of:
+                    seen_of[new_used] = seen | m
+                new_key = (new_used, new_last)
+                val = (score[0] + add_units, score[1] - add_v3)
+                if upper_bound is not None and val[0] > upper_bound:
+                    continue
+                old = nxt.get(new_key)
+                if old is None:
+                    total_states += 1
+                    if total_states > max_states:
+                        return TOO_LARGE, None
+                    nxt[new_key] = (val, key)
+                elif val < old[0]:  # (단위, -v3) 사전식: 남은 칸 점수는 상태에만 달려 있어 합쳐도 됨
+                    nxt[new_key] = (val, key)
+        if not nxt:
+            return INFEASIBLE, None
+        layers.append(nxt)
+
+    # 마지막 층에서 최소 → 이전 상태를 따라 복원
+    best_key = min(layers[-1], key=lambda x: layers[-1][x][0])
+    order: List[int] = []
+    key = best_key
+    for k in range(n, 0, -1):
+        used, last = key
+        prev_key = layers[k][key][1]
+        order.append((used & ~prev_key[0]).bit_length() - 1)
+        key = prev_key
+    order.reverse()
+    return OPTIMAL, order
@@ -0,0 +1,610 @@
+# timetable/generate.py - 제약 검사/점수/후보안 수집 (app.py에서 사용)
+# ------------------------------------------------
+# - 1차(강제): NumPy 배치 샘플링으로 먼저 훑고(조건이 느슨할 때 빠름),
+#   부족분은 timetable 제약 전파 엔진(solve_many: seed 하나의 탐색에서 서로 다른 해를 여러 개)
+#   → 생성(배치/엔진 제너레이터) → 즉시 채점(rank_key) → 상위 K개만 힙(TopK)에 유지하는 흐름이라
+#     samples개(수천 개)를 훑어도 메모리는 K에 비례, progress 콜백으로 중간 상위 K를 UI에 전달
+# - 후보는 Candidate(array('H') 무대 id + 미리 계산한 해시)로 주고받음, 이름 변환은 표시/저장하는 쪽에서
+# - 2차(완화): 랜덤 채우기에서 시작한 최소 위반 탐색(relax), 위반 적은 순으로 정렬
+#   (seed RELAX_SEEDS_PER_CANDIDATE배까지 탐색, 그래도 부족하면 랜덤 채우기로 보충)
+#   seed당 반복 수는 고정(RELAX_ITERS × 무대 수), 마감은 seed를 통째로 건너뛸 때만 씀
+# - 예산: 제한 시간(time_limit초)을 작업량(무대 수 × (탐색 노드 + 해))으로 환산해 멈춤 판단은 작업량으로만
+#   → 같은 seed면 기계 부하와 무관하게 같은 결과. 벽시계 마감은 느린 기계를 위한 안전장치(드물게 걸림)
+#   · 1차 작업량은 제한 시간의 (1 - RELAX_TIME_SHARE) × WORK_PER_SECOND, 2차는 seed 수가 정해져 있음
+#   · 1차 seed당 노드 예산은 작게 시작해 ESCALATE_EVERY번 시도마다 2배(쉬운 공연은 금방, 어려운 공연은 깊게)
+#   · 시도 결과로 새 후보가 나올 확률을 추정(Good–Turing)해 남은 작업량에 기대되는 새 후보가
+#     STOP_EXPECTED_NEW 미만이면 1차를 일찍 끝내고 2차로 넘어감(같은 해만 반복/성공 가망 없음)
+# - 최적 증명: 작은 공연은 비트마스크 DP(exact)로 순위 키 전체(근접 재등장 단위, -v3 점수)의 최적해
+#   DP가 증명한 경우에만 '최적'(단위 0만으로는 v3 점수가 최적인지 모름)
+#   DP도 생성 마감(time_limit) 안에서만, 시간이 남지 않았으면 건너뜀
+# - stats(GenStats)를 주면 단계별 시도/중복/탈락·가지치기 이유/시간을 모으고
+#   두 단계가 끝나면 JSON 한 줄로 로그(logger "timetable.generate")
+# - workers > 1이면 seed 구간을 프로세스 풀에 나눠 풀고, seed 순서대로 합쳐
+#   같은 seed0에서 직렬 경로와 똑같은 후보 리스트를 만든다(멈춤 판단이 seed 순서의 작업량 기준,
+#   벽시계 안전장치에 걸리지 않을 때)
+#   풀은 배치 샘플링으로 부족할 때 처음 띄움(LazyPool, 쉬운 공연은 프로세스 기동 비용 없음)
+
+from typing import Callable, List, Dict, Tuple, Optional, Iterable, Iterator
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from time import perf_counter
+import itertools
+import logging
+import multiprocessing
+import random
+import time
+
+from . import batch
+from .analyze import infeasible_reasons
+from .candidate import Candidate
+from .anneal import anneal
+from .exact import OPTIMAL, solve_exact
+from .problem import Problem
+from .relax import min_violation, violation_penalty, violating_performers
+from .scoring import app_score, rank_key
+from .solver import solve, solve_many
+from .stats import GenStats, Progress, STOP_DEADLINE, STOP_ENOUGH, STOP_EXHAUSTED, STOP_SATURATED
+from .topk import TopK
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TIME_LIMIT = 10.0  # 후보안 생성 전체 제한 시간(초)
+DEFAULT_SAMPLES = 1000     # 검토할 배치 수 기본값(앱/CLI)
+RELAX_TIME_SHARE = 0.25    # 1차가 다 못 채울 때를 대비해 2차 몫으로 남겨 두는 비율
+BATCH_SAMPLES = 16384  # 강제 단계 배치 샘플링 예산(순열 수)
+ENUM_PER_SEED = 32      # 많이 훑을 때 seed 하나에서 열거할 해 수(요청 개수가 더 크면 그만큼)
+PROGRESS_INTERVAL = 0.2  # 중간 상태 전달 간격(초)
+WORK_PER_SECOND = 1_000_000  # 1차 작업량 환산(무대 수 × (탐색 노드 + 해) / 초, 보통 PC 속도의 절반쯤 → 마감 전에 끝남)
+STRICT_BASE_NODES = 20  # 강제 단계 seed당 탐색 노드 시작 예산(무대 수 × 이 값)
+ESCALATE_EVERY = 16     # 이만큼 시도할 때마다 seed당 노드 예산 2배
+MAX_ESCALATE = 6        # 최대 2^6배
+MIN_ATTEMPTS = 16       # 조기 중단 판단 전 최소 시도 수
+STOP_EXPECTED_NEW = 0.5  # 남은 작업량에 기대되는 새 후보가 이보다 적으면 1차 중단
+RELAX_SEEDS_PER_CANDIDATE = 3  # 완화 단계 최소 위반 탐색 seed 수(후보 1개당)
+RELAX_ITERS = 30        # 완화 단계 seed당 최소 위반 탐색 반복(무대 수 × 이 값)
+RELAX_FILL_TRIES = 64   # 완화 단계 랜덤 채우기 보충 seed 수(후보 1개당)
+
+
+def check_constraints(
+    schedule: List[str],
+    problem: Problem,
+    r_rest: int,
+    min_rest_seconds: int,
+    enforce_rest: bool,
+    starts: Optional[List[int]] = None,
+) -> bool:
+    """True=통과. enforce_rest=False이면 휴식제약은 무시. starts는 problem.start_times 결과(없으면 생성)"""
+    if not enforce_rest:
+        return True
+
+    return problem.feasible(problem.ids(schedule), r_rest, min_rest_seconds, starts)
+
+
+def score_schedule(schedule: List[str], problem: Problem) -> float:
+    """간단 점수(낮을수록 좋음): 총 길이 + 근접 재등장 약한 패널티 (scoring.app_score)"""
+    return app_score(problem, problem.ids(schedule))
+
+
+def fill_board_random(board: List[int], remain: List[int], seed: int) -> List[int]:
+    """빈 칸(-1)에 remain을 랜덤 채우기"""
+    rnd = random.Random(seed)
+    rem = remain[:]
+    rnd.shuffle(rem)
+    out = board[:]
+    j = 0
+    for i in range(len(out)):
+        if out[i] < 0:
+            out[i] = rem[j]
+            j += 1
+    return out
+
+
+def _solve_order(
+    problem: Problem,
+    r_rest: int,
+    seed: int,
+    min_rest_seconds: int,
+    enforce_rest: bool,
+    max_tries: int,
+    counts: Optional[Dict[str, int]] = None,
+    deadline: Optional[float] = None,
+) -> Optional[List[int]]:
+    """solve_with_seed의 무대 id 버전. 실패 시 None
+    (완화 모드는 랜덤 채우기에서 max_tries번 최소 위반 탐색, 반복 수가 정해져 있어 deadline은 안 씀)"""
+    if len(problem) == 0:
+        return None
+    if not enforce_rest:
+        start = fill_board_random(problem.board, problem.free, seed)
+        order, _ = min_violation(problem, start, r_rest, min_rest_seconds, max_iters=max_tries, seed=seed)
+        return order
+    ok, order = solve(problem, r_rest, min_rest_seconds, seed=seed, max_nodes=max_tries, counts=counts,
+                      deadline=deadline)
+    return order if ok else None
+
+
+def _solve_orders(
+    problem: Problem,
+    r_rest: int,
+    seed: int,
+    min_rest_seconds: int,
+    enforce_rest: bool,
+    max_tries: int,
+    k: int,
+    counts: Optional[Dict[str, int]] = None,
+    deadline: Optional[float] = None,
+) -> List[List[int]]:
+    """seed 하나의 결과 목록. 강제는 한 번의 탐색에서 서로 다른 해 최대 k개, 완화는 최소 위반 해 1개.
+    deadline이 이미 지났으면 seed를 통째로 건너뜀(빈 목록)"""
+    if deadline is not None and time.time() > deadline:
+        return []
+    if not enforce_rest or len(problem) == 0:
+        order = _solve_order(problem, r_rest, seed, min_rest_seconds, enforce_rest, max_tries, counts, deadline)
+        return [] if order is None else [order]
+    return solve_many(problem, r_rest, min_rest_seconds, k=k, seed=seed, max_nodes=max_tries,
+                      counts=counts, deadline=deadline)
+
+
+def solve_with_seed(
+    problem: Problem,
+    r_rest: int,
+    seed: int,
+    min_rest_seconds: int,
+    enforce_rest: bool,
+    max_tries: int,
+    counts: Optional[Dict[str, int]] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[bool, Optional[List[str]]]:
+    """주어진 seed로 유효 스케줄 찾기
+    (강제 모드는 timetable 제약 전파 엔진, 탐색 노드 max_tries개까지 / 완화 모드는 최소 위반 탐색)
+    counts를 주면 탐색 노드/재시작/가지치기 이유별 횟수를 더해 줌, deadline(time.time() 기준)이 지나면 실패"""
+    order = _solve_order(problem, r_rest, seed, min_rest_seconds, enforce_rest, max_tries, counts, deadline)
+    if order is None:
+        return False, None
+    return True, problem.to_names(order)
+
+
+def _attempt_tries(n: int, enforce_rest: bool, k: int) -> int:
+    """k번째 시도(0부터)의 seed당 예산. 강제는 ESCALATE_EVERY번마다 노드 예산 2배, 완화는 고정 반복"""
+    if not enforce_rest:
+        return RELAX_ITERS * n
+    return (STRICT_BASE_NODES * n) << min(k // ESCALATE_EVERY, MAX_ESCALATE)
+
+
+# ========================= 병렬 seed 스트림 =========================
+_WORKER_PROBLEM: Optional[Problem] = None
+
+
+def _init_worker(problem: Problem) -> None:
+    global _WORKER_PROBLEM
+    _WORKER_PROBLEM = problem
+
+
+def _solve_seed_range(
+    seed0: int,
+    k_start: int,
+    count: int,
+    r_rest: int,
+    min_rest_seconds: int,
+    enforce_rest: bool,
+    per_seed: int,
+    deadline: Optional[float],
+) -> List[Tuple[List[List[int]], Dict[str, int]]]:
+    """워커: seed0+k_start부터 count개 seed의 (결과 목록, 탐색 카운터) (순서 유지)"""
+    n = len(_WORKER_PROBLEM)
+    out = []
+    for k in range(k_start, k_start + count):
+        counts: Dict[str, int] = {}
+        orders = _solve_orders(_WORKER_PROBLEM, r_rest, seed0 + k, min_rest_seconds, enforce_rest,
+                               _attempt_tries(n, enforce_rest, k), per_seed, counts, deadline)
+        out.append((orders, counts))
+    return out
+
+
+def open_pool(problem: Problem, workers: int) -> ProcessPoolExecutor:
+    """problem을 미리 실어 둔 프로세스 풀 (spawn: Streamlit 스레드와 fork 충돌 방지)"""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(problem,),
+    )
+
+
+class LazyPool(Executor):
+    """처음 submit할 때 open_pool로 여는 풀(배치 샘플링만으로 끝나면 프로세스를 띄우지 않음)"""
+
+    def __init__(self, problem: Problem, workers: int):
+        self._problem = problem
+        self._workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, fn, *args, **kwargs):
+        if self._pool is None:
+            self._pool = open_pool(self._problem, self._workers)
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def _seed_stream(
+    problem: Problem,
+    r_rest: int,
+    seed0: int,
+    count: Optional[int],
+    min_rest_seconds: int,
+    enforce_rest: bool,
+    pool: Optional[Executor],
+    workers: int,
+    per_seed: int = 1,
+    deadline: Optional[float] = None,
+) -> Iterator[Tuple[List[List[int]], Dict[str, int]]]:
+    """seed0, seed0+1, ... 순서대로 seed별 (결과 목록, 탐색 카운터) 내보내기
+    (count=None이면 끝없이, 멈추는 건 소비 측). 강제 단계는 seed마다 서로 다른 해를 per_seed개까지.
+    풀이 있으면 청크 단위로 앞서 돌려 두고, 소비가 끝나면 남은 작업은 취소.
+    카운터도 seed별 → 소비한 seed까지만 더하면 직렬과 같은 값"""
+    n = len(problem)
+    if pool is None or workers <= 1:
+        for k in (itertools.count() if count is None else range(count)):
+            counts: Dict[str, int] = {}
+            orders = _solve_orders(problem, r_rest, seed0 + k, min_rest_seconds, enforce_rest,
+                                   _attempt_tries(n, enforce_rest, k), per_seed, counts, deadline)
+            yield orders, counts
+        return
+
+    chunk = 4
+    next_k = 0
+    pending: deque = deque()
+    try:
+        while True:
+            while len(pending) < 2 * workers and (count is None or next_k < count):
+                size = chunk if count is None else min(chunk, count - next_k)
+                pending.append(pool.submit(
+                    _solve_seed_range, seed0, next_k, size,
+                    r_rest, min_rest_seconds, enforce_rest, per_seed, deadline
+                ))
+                next_k += size
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
+def _expected_new(singletons: int, solved: int, spent: int, remaining: int) -> float:
+    """남은 작업량에 기대되는 새 후보 수.
+    해당 새 해 확률은 Good–Turing 추정(한 번만 나온 해 수 / 해 수), 한 번만 나온 해가 없으면
+    1 / (해 수 + 1)개로 봄(아직 해가 없으면 1개). 남은 해 수는 지금까지의 작업량당 해 수로 환산
+    → 해 수가 약분돼 (한 번만 나온 해 수) × 남은/쓴 작업량(시간이 아니라 작업량 → 같은 seed면 같은 판단)"""
+    missing = max(singletons, 1 / (solved + 1))
+    return missing * remaining / max(spent, 1)
+
+
+def make_candidates_one_phase(
+    problem: Problem,
+    r_rest: int,
+    num_candidates: int,
+    seed0: int,
+    min_rest_seconds: int,
+    enforce_rest: bool,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    workers: int = 1,
+    pool: Optional[Executor] = None,
+    stats: Optional[GenStats] = None,
+    samples: Optional[int] = None,
+    progress: Optional[Callable[[Progress], None]] = None,
+    deadline: Optional[float] = None,
+) -> List[Candidate]:
+    """한 단계(강제 or 완화)에서 후보안 수집. 강제는 순위 키(rank_key)순, 완화는 (위반 벌점, 순위 키)순.
+    강제는 서로 다른 유효 스케줄을 samples개(None이면 num_candidates개)까지 훑으며 상위 num_candidates개만 유지.
+    강제는 time_limit초를 작업량(× WORK_PER_SECOND)으로 환산해 그만큼 탐색, 남은 작업량에 새 후보가 나올
+    가망이 없으면 일찍 멈춤(멈춤 판단은 작업량 기준 → 같은 seed면 같은 결과).
+    벽시계 마감(deadline, 없으면 time_limit초 뒤)은 느린 기계를 위한 안전장치.
+    workers > 1이면 프로세스 풀 사용(pool을 주면 재사용, 없으면 seed 탐색이 필요할 때 띄움),
+    안전장치에 걸리지 않으면 결과는 직렬과 동일.
+    stats를 주면 해당 단계 카운터/시간/멈춘 이유와 위반 원인 참가자(표본)를 기록.
+    progress를 주면 강제 단계 중 PROGRESS_INTERVAL초마다 중간 상태를 넘김"""
+    if workers > 1 and pool is None:
+        with LazyPool(problem, workers) as own_pool:
+            return make_candidates_one_phase(
+                problem, r_rest, num_candidates, seed0, min_rest_seconds,
+                enforce_rest, time_limit, workers=workers, pool=own_pool, stats=stats,
+                samples=samples, progress=progress, deadline=deadline
+            )
+
+    t0 = perf_counter()
+    if deadline is None:
+        deadline = time.time() + time_limit
+    counts: Dict[str, int] = {}
+    rejected: Optional[List[List[int]]] = [] if stats is not None else None
+    target = num_candidates if samples is None else max(samples, num_candidates)
+    top = TopK(num_candidates)  # 강제: 상위 K개만
+    examined = set()            # 강제: 본 해의 해시(정수만 보관 → 표본 수가 커도 가벼움)
+    found: List[Candidate] = []  # 완화: 모은 순서대로
+    seen = set()
+    stop = STOP_ENOUGH
+    last_report = [perf_counter()]
+
+    def report(force: bool = False) -> None:
+        now = perf_counter()
+        if progress is None or not (force or now - last_report[0] >= PROGRESS_INTERVAL):
+            return
+        last_report[0] = now
+        progress(Progress(examined=len(examined), kept=len(top), best=[c for _, c in top.items()],
+                          seconds=now - t0, time_limit=time_limit))
+
+    def add(cand: Candidate) -> bool:
+        if enforce_rest:
+            h = hash(cand)
+            if h in examined:
+                counts["duplicates"] = counts.get("duplicates", 0) + 1
+                return False
+            examined.add(h)
+            top.push(rank_key(problem, cand.ids), cand)
+            report()
+            return True
+        if cand in seen:
+            counts["duplicates"] = counts.get("duplicates", 0) + 1
+            return False
+        seen.add(cand)
+        found.append(cand)
+        return True
+
+    def enough() -> bool:
+        return len(examined) >= target if enforce_rest else len(found) >= num_candidates
+
+    # 강제 단계: 배치 샘플링으로 먼저 수집 (한 배치에서 하나도 안 나오면 바로 엔진으로)
+    # 배치는 중복을 포함하므로 개수 판단은 여기서(서로 다른 배치 기준)
+    if enforce_rest and batch.available():
+        for order in batch.iter_valid(
+            problem, r_rest, min_rest_seconds, seed0, BATCH_SAMPLES,
+            stop_on_empty=True, counts=counts, rejected=rejected,
+            deadline=deadline
+        ):
+            if enough():
+                break
+            add(Candidate(order))
+
+    hard_cap = None if enforce_rest else num_candidates * RELAX_SEEDS_PER_CANDIDATE
+    if not enough():
+        # 강제: seed 하나에서 여러 해를 열거(개수는 고정 → 병렬과 결과 동일)
+        per_seed = min(target, max(num_candidates, ENUM_PER_SEED))
+        stream = _seed_stream(
+            problem, r_rest, seed0, hard_cap, min_rest_seconds,
+            enforce_rest, pool, workers, per_seed, deadline
+        )
+        hits: Dict[int, int] = {}  # 엔진이 돌려준 해(해시) → 횟수 (Good–Turing 추정용)
+        singletons = solved = attempts = 0
+        budget = max(1, int(time_limit * WORK_PER_SECOND))  # 강제: 작업량(무대 수 × (탐색 노드 + 해))
+        spent = 0
+        stop = STOP_EXHAUSTED
+        try:
+            for orders, seed_counts in stream:
+                attempts += 1
+                for key, v in seed_counts.items():
+                    counts[key] = counts.get(key, 0) + v
+                spent += (seed_counts.get("nodes", 0) + len(orders) + 1) * len(problem)  # 해마다 채점도 O(n)
+                for order in orders:
+                    solved += 1
+                    cand = Candidate(order)
+                    h = hash(cand)
+                    c = hits.get(h, 0)
+                    hits[h] = c + 1
+                    singletons += 1 if c == 0 else -1 if c == 1 else 0
+                    add(cand)
+                    if enough():
+                        break
+                if enough():
+                    stop = STOP_ENOUGH
+                    break
+                if time.time() > deadline:  # 안전장치(느린 기계)
+                    stop = STOP_DEADLINE
+                    break
+                if not enforce_rest:
+                    continue
+                if spent >= budget:
+                    break
+                if (attempts >= MIN_ATTEMPTS and
+                        _expected_new(singletons, solved, spent, budget - spent) < STOP_EXPECTED_NEW):
+                    stop = STOP_SATURATED
+                    break
+        finally:
+            stream.close()
+        counts["attempts"] = counts.get("attempts", 0) + attempts
+        counts["solved"] = counts.get("solved", 0) + solved
+
+    # 완화: 탐색이 같은 해로 모여 부족하면 랜덤 채우기로 보충(기존 완화 방식, 제한 시간과 무관하게 빠름)
+    if not enforce_rest and len(problem):
+        seed = seed0 + hard_cap
+        while len(found) < num_candidates and seed < seed0 + hard_cap + num_candidates * RELAX_FILL_TRIES:
+            add(Candidate(fill_board_random(problem.board, problem.free, seed)))
+            seed += 1
+
+    if enforce_rest:
+        report(force=True)
+        counts["examined"] = len(examined)
+    if stats is not None:
+        ph = stats.phase(enforce_rest)
+        ph.merge(counts)
+        ph.seconds += perf_counter() - t0
+        ph.stop = stop
+        # 위반 원인 참가자(표본 추정): 강제는 배치 탈락 순열 최대 64개, 완화는 최종 후보의 위반
+        # (엔진 가지치기는 도메인이 비는 식이라 참가자 하나로 돌릴 수 없어 세지 않음)
+        for order in (rejected if enforce_rest else found):
+            stats.add_performers([problem.performers[p] for p in
+                                  violating_performers(problem, order, r_rest, min_rest_seconds)])
+
+    if enforce_rest:
+        return [cand for _, cand in top.items()]
+    found.sort(key=lambda c: (violation_penalty(problem, c.ids, r_rest, min_rest_seconds),
+                              rank_key(problem, c.ids)))
+    return found
+
+
+def make_candidates_two_phase(
+    problem: Problem,
+    r_rest: int,
+    num_candidates: int,
+    seed0: int,
+    min_rest_seconds: int,
+    workers: int = 1,
+    exact: bool = True,
+    stats: Optional[GenStats] = None,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    samples: Optional[int] = None,
+    progress: Optional[Callable[[Progress], None]] = None,
+) -> Tuple[List[Candidate], int, int]:
+    """
+    1차(강제)에서 유효 스케줄을 samples개(None이면 후보 수만큼)까지 훑어 상위 num_candidates개
+    → 부족하면 2차(완화)로 부족분 보충.
+    반환: (최종 후보 리스트, 최종 리스트 중 '강제'로 찾은 개수, 앞에서부터 '최적 증명'된 개수)
+    ※ 전체 탐색은 time_limit초 안: 1차는 그중 (1 - RELAX_TIME_SHARE)까지, 나머지는 2차 몫
+    ※ workers > 1이면 두 단계가 프로세스 풀 하나를 함께 사용(seed 탐색이 필요해질 때 처음 띄움)
+    ※ 사전 검사(infeasible_reasons)로 불가능이 증명되면 1차는 건너뜀
+    ※ exact=True이고 상태 공간이 예산 안이면 비트마스크 DP로 최적해를 구해 맨 앞에 둠
+    ※ stats(GenStats)를 주면 진단 카운터를 채우고 끝에 JSON 한 줄로 로그
+    ※ progress(Progress 콜백)를 주면 1차 중 중간 상위 후보를 주기적으로 넘김
+    """
+    if time_limit <= 0:
+        raise ValueError("제한 시간은 0보다 커야 합니다.")
+    if num_candidates < 1:
+        raise ValueError("후보안 개수는 1 이상이어야 합니다.")
+    t0 = perf_counter()
+    if workers > 1:
+        with LazyPool(problem, workers) as pool:
+            out = _two_phase(problem, r_rest, num_candidates, seed0, min_rest_seconds, workers, pool, exact,
+                             stats, time_limit, samples, progress)
+    else:
+        out = _two_phase(problem, r_rest, num_candidates, seed0, min_rest_seconds, 1, None, exact,
+                         stats, time_limit, samples, progress)
+    if stats is not None:
+        stats.time_limit = time_limit
+        stats.total_seconds = perf_counter() - t0
+        log.info("generate_stats %s", stats.to_json())
+    return out
+
+
+def _apply_exact(
+    problem: Problem,
+    strict: List[Candidate],
+    r_rest: int,
+    min_rest_seconds: int,
+    exact: bool,
+    stats: Optional[GenStats] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Candidate], int]:
+    """강제 후보(순위 키순)에 최적해 반영 → (후보, 앞에서부터 최적 증명 개수).
+    최적은 DP가 순위 키 전체(단위, -v3)의 최솟값을 증명했을 때만
+    (단위 0은 r ≥ 2면 모든 유효 스케줄이 같아 v3 점수까지 최적이라는 뜻이 아님). DP도 deadline(생성 마감)까지만"""
+    if not exact or (deadline is not None and time.time() >= deadline):
+        return strict, 0
+    keys = [rank_key(problem, c.ids) for c in strict]
+    # 이미 찾은 최선보다 단위가 나쁜 상태는 DP에서 버림
+    t0 = perf_counter()
+    status, order = solve_exact(problem, r_rest, min_rest_seconds,
+                                upper_bound=keys[0][0] if keys else None, deadline=deadline)
+    if stats is not None:
+        stats.exact_status = status
+        stats.exact_seconds = perf_counter() - t0
+    if status != OPTIMAL:
+        return strict, 0
+    best = rank_key(problem, order)
+    if not keys or best < keys[0]:
+        # 찾은 후보보다 확실히 나을 때만 맨 앞에(같으면 순위 키 순서 유지)
+        cand = Candidate(order)
+        kept = [(c, k) for c, k in zip(strict, keys) if c != cand]
+        strict = [cand] + [c for c, _ in kept]
+        keys = [best] + [k for _, k in kept]
+    count = 0
+    while count < len(keys) and keys[count] == best:
+        count += 1
+    return strict, count
+
+
+def _two_phase(
+    problem: Problem,
+    r_rest: int,
+    num_candidates: int,
+    seed0: int,
+    min_rest_seconds: int,
+    workers: int,
+    pool: Optional[Executor],
+    exact: bool = True,
+    stats: Optional[GenStats] = None,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    samples: Optional[int] = None,
+    progress: Optional[Callable[[Progress], None]] = None,
+) -> Tuple[List[Candidate], int, int]:
+    deadline = time.time() + time_limit
+
+    # 1차: 강제 (불가능이 증명되면 예산을 쓰지 않음)
+    strict: List[Candidate] = []
+    optimal_count = 0
+    reasons = infeasible_reasons(problem, r_rest, min_rest_seconds)
+    if stats is not None:
+        stats.infeasible_reasons = list(reasons)
+    if not reasons:
+        strict = make_candidates_one_phase(
+            problem, r_rest, num_candidates, seed0, min_rest_seconds,
+            enforce_rest=True, time_limit=time_limit * (1 - RELAX_TIME_SHARE),
+            workers=workers, pool=pool, stats=stats, samples=samples, progress=progress,
+            deadline=deadline  # 안전장치는 전체 마감(프로세스 기동 등으로 작업량 예산이 잘리지 않게)
+        )
+        strict, optimal_count = _apply_exact(problem, strict, r_rest, min_rest_seconds, exact, stats, deadline)
+        strict = strict[:num_candidates]
+        optimal_count = min(optimal_count, num_candidates)
+    strict_count = len(strict)
+
+    if strict_count >= num_candidates:
+        return strict, strict_count, optimal_count
+
+    # 2차: 완화로 부족분 보충 (시드 영역 분리, 1차가 일찍 끝났으면 남은 시간 전부)
+    remaining = num_candidates - strict_count
+    relaxed = make_candidates_one_phase(
+        problem, r_rest, remaining, seed0 + 10_000,
+        min_rest_seconds=min_rest_seconds, enforce_rest=False,
+        time_limit=max(0.0, deadline - time.time()),
+        workers=workers, pool=pool, stats=stats
+    )
+
+    # 중복 없이 합치기
+    seen = set(strict)
+    for cand in relaxed:
+        if cand not in seen:
+            strict.append(cand)
+            seen.add(cand)
+        if len(strict) == num_candidates:
+            break
+
+    return strict, strict_count, optimal_count
+
+
+def polish_candidates(
+    problem: Problem,
+    candidates: List[Candidate],
+    r_rest: int,
+    min_rest_seconds: int,
+    time_budget: float,
+    seed: int,
+    exclude: Iterable[Candidate] = (),
+) -> List[Candidate]:
+    """휴식 조건을 만족하는 후보를 담금질로 v3 점수 개선(시간 예산은 후보 수로 나눔).
+    조건 불만족 후보는 그대로, 다듬은 결과가 다른 후보나 exclude(일부만 다듬을 때 나머지 후보)와
+    겹치면 원본 유지"""
+    if not candidates:
+        return candidates
+    per = time_budget / len(candidates)
+    out: List[Candidate] = []
+    seen = set(candidates)
+    seen.update(exclude)
+    for k, cand in enumerate(candidates):
+        if problem.feasible(cand.ids, r_rest, min_rest_seconds):
+            better = Candidate(anneal(problem, cand.to_list(), r_rest, min_rest_seconds,
+                                      time_budget=per, seed=seed + k))
+            if better != cand and better not in seen:
+                seen.add(better)
+                cand = better
+        out.append(cand)
+    return out
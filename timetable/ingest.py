@@ -0,0 +1,129 @@
+# timetable/ingest.py - 무대 표 정규화/검증 (열 단위 pandas 연산, iterrows 없음)
+# ------------------------------------------------
+# - 입력: 무대 DataFrame(이름/길이(초)/참가자/고정순서, 영문 name/duration/performers/fixed도 허용)
+# - 열 단위 처리: 이름 trim, 길이 to_numeric, 참가자 split → explode → strip(→ 무대 경계에서 np.split),
+#   고정순서 to_numeric
+# - 검사(전부 모아서 한 번에 보고)
+#   · 오류: 필수 열 누락, 길이(초) 숫자 아님, 고정순서 1 미만/무대 수 초과/정수 아님, 고정순서 중복, 무대 이름 중복
+#   · 경고: HEAVY_PERFORMER_STAGES개 이상 무대에 나오는 참가자
+#   중복 검사는 value_counts/duplicated(O(n)), 행 번호는 엑셀 기준(헤더 1행 → 첫 무대 2행)
+# - 이름이 빈 행은 건너뜀(엑셀의 빈 줄)
+# - 오류가 있으면 rows는 비우고, 점검용 스크립트가 쓸 수 있게 읽은 만큼은 draft에
+# - workbook.normalize_rows_from_df(앱/CLI)와 parse_template.py/place_fixed.py/스케줄러 스크립트가 사용
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+HEAVY_PERFORMER_STAGES = 3  # 이 이상 출연하면 경고
+COLUMN_ALIASES = {"name": "이름", "duration": "길이(초)", "performers": "참가자", "fixed": "고정순서"}
+REQUIRED_COLUMNS = ["이름", "길이(초)", "참가자"]
+EXCEL_ROW_OFFSET = 2  # DataFrame 위치 0 → 엑셀 2행
+
+
+@dataclass
+class Issue:
+    row: Optional[int]  # 엑셀 행 번호(표 전체에 대한 문제면 None)
+    column: str
+    message: str
+
+    def __str__(self) -> str:
+        return self.message if self.row is None else f"{self.row}행: {self.message}"
+
+
+@dataclass
+class StageReport:
+    rows: List[Dict] = field(default_factory=list)  # 정규화한 무대(name/duration/performers/fixed), 오류가 있으면 비움
+    draft: List[Dict] = field(default_factory=list)  # 오류가 있어도 읽은 만큼(잘못된 길이/고정순서는 None)
+    errors: List[Issue] = field(default_factory=list)
+    warnings: List[Issue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_if_errors(self) -> None:
+        """오류가 있으면 전부 담은 ValueError"""
+        if self.errors:
+            raise ValueError("\n".join(str(e) for e in self.errors))
+
+
+def _blank(s: pd.Series) -> pd.Series:
+    """NaN/None/공백 문자열 → True"""
+    return s.isna() | s.astype("string").str.strip().fillna("").eq("")
+
+
+def _excel_rows(index: pd.Index) -> List[int]:
+    return [int(i) + EXCEL_ROW_OFFSET for i in index]
+
+
+def validate_stages(df: pd.DataFrame) -> StageReport:
+    """무대 DataFrame → 정규화한 rows + 오류/경고 전부"""
+    report = StageReport()
+    df = df.rename(columns={k: v for k, v in COLUMN_ALIASES.items() if k in df.columns})
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        report.errors.append(Issue(None, ", ".join(missing), f"필수 열 누락: {missing}"))
+        return report
+
+    df = df.reset_index(drop=True)
+    names = df["이름"].astype("string").str.strip()
+    keep = names.notna() & names.ne("")
+    df, names = df[keep], names[keep]
+    n = len(df)
+
+    # 길이(초)
+    dur = pd.to_numeric(df["길이(초)"], errors="coerce")
+    for i in dur.index[dur.isna()]:
+        report.errors.append(Issue(i + EXCEL_ROW_OFFSET, "길이(초)", f"길이(초)는 숫자여야 합니다: 무대={names[i]}"))
+
+    # 고정순서 (빈칸 = 고정 안 함)
+    if "고정순서" in df.columns:
+        fx_raw = df["고정순서"]
+        fx_blank = _blank(fx_raw)
+        fx = pd.to_numeric(fx_raw.where(~fx_blank), errors="coerce")
+        bad = ~fx_blank & (fx.isna() | (fx < 1) | (fx != fx.round()))
+        for i in fx.index[bad]:
+            report.errors.append(Issue(i + EXCEL_ROW_OFFSET, "고정순서",
+                                       f"고정순서는 1 이상의 정수여야 합니다: 무대={names[i]}"))
+        over = ~bad & (fx > n)
+        for i in fx.index[over]:
+            report.errors.append(Issue(i + EXCEL_ROW_OFFSET, "고정순서",
+                                       f"고정순서 {int(fx[i])}이(가) 무대 수({n})보다 큽니다: 무대={names[i]}"))
+        fx = fx.where(~bad & ~over)
+        dup_fx = fx.dropna()
+        dup_fx = dup_fx[dup_fx.duplicated(keep=False)]
+        for pos, group in dup_fx.groupby(dup_fx):
+            report.errors.append(Issue(None, "고정순서", f"고정순서 {int(pos)}이(가) 중복됩니다: "
+                                       f"{', '.join(names[group.index])} (행 {_excel_rows(group.index)})"))
+    else:
+        fx = pd.Series(float("nan"), index=df.index)
+
+    # 무대 이름 중복
+    counts = names.value_counts()
+    for name in counts.index[counts > 1]:
+        idx = names.index[names == name]
+        report.errors.append(Issue(None, "이름", f"무대 이름이 중복됩니다: {name} (행 {_excel_rows(idx)})"))
+
+    # 참가자: 쉼표로 나눠 한 줄에 한 명 → 다듬기 → 무대별 리스트
+    perf = df["참가자"].where(~_blank(df["참가자"]), "").astype(str).str.split(",").explode().str.strip()
+    perf = perf[perf.ne("")]
+    # explode는 행 순서를 유지 → 무대 경계에서 잘라 리스트로(그룹별 파이썬 집계보다 훨씬 빠름)
+    cuts = np.searchsorted(perf.index.to_numpy(), df.index.to_numpy()[1:])
+    performers = [part.tolist() for part in np.split(perf.to_numpy(), cuts)] if n else []
+
+    pairs = pd.DataFrame({"stage": perf.index, "performer": perf.to_numpy()}).drop_duplicates()
+    heavy = pairs["performer"].value_counts()
+    for name, k in heavy[heavy >= HEAVY_PERFORMER_STAGES].sort_index().items():
+        report.warnings.append(Issue(None, "참가자", f"{HEAVY_PERFORMER_STAGES}회 이상 출연: {name} ({k}개 무대)"))
+
+    report.draft = [
+        {"name": name, "duration": None if pd.isna(d) else int(d), "performers": p,
+         "fixed": None if pd.isna(f) else int(f)}
+        for name, d, p, f in zip(names.tolist(), dur.tolist(), performers, fx.tolist())
+    ]
+    if not report.errors:
+        report.rows = report.draft
+    return report
@@ -0,0 +1,146 @@
+# timetable/problem.py - 정수 id로 컴파일한 문제 표현
+# ------------------------------------------------
+# - 무대 id = rows 순서(0..n-1), 참가자 id = 처음 등장한 순서
+# - 길이는 array('l'), 무대별 참가자 집합은 int 비트마스크
+#   → 두 무대의 참가자 겹침 검사는 perf_masks[a] & perf_masks[b] 한 번
+# - 무대×무대 충돌(참가자 공유) 구조를 한 번만 계산: 비트마스크 행 + n×n 바이트 행렬
+#   → 휴식(r) 검사는 이미 놓인 앞뒤 r개 무대에 대한 상수시간 조회
+# - 스케줄(order)은 슬롯별 무대 id 리스트, 이름 변환은 입출력 경계에서만
+
+from array import array
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Sequence, Optional
+
+
+def popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+@dataclass
+class Problem:
+    names: List[str]                  # 무대 id → 이름
+    index: Dict[str, int]             # 이름 → 무대 id
+    durations: array                  # 무대 id → 길이(초)
+    performers: List[str]             # 참가자 id → 이름
+    perf_ids: List[Tuple[int, ...]]   # 무대 id → 참가자 id들(입력 순서, 중복 제거)
+    perf_masks: List[int]             # 무대 id → 참가자 비트마스크
+    board: List[int]                  # 슬롯 → 고정 무대 id (-1=빈 칸)
+    free: List[int]                   # 고정되지 않은 무대 id (rows 순서)
+    conflicts: List[int]              # 무대 id → 참가자를 공유하는 다른 무대들의 비트마스크
+    adjacency: bytearray              # adjacency[a*n+b]=1 ⇔ a, b가 참가자 공유(a≠b)
+    degree: List[int]                 # 무대 id → 충돌 무대 수
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def ids(self, schedule: Sequence[str]) -> List[int]:
+        index = self.index
+        return [index[s] for s in schedule]
+
+    def to_names(self, order: Sequence[int]) -> List[str]:
+        names = self.names
+        return [names[s] for s in order]
+
+    def clashes(self, a: int, b: int) -> bool:
+        """두 무대가 참가자를 공유하는지 (O(1))"""
+        return self.adjacency[a * len(self.names) + b] == 1
+
+    def feasible(
+        self,
+        order: Sequence[int],
+        r_rest: int,
+        min_rest_seconds: int,
+        starts: Optional[List[int]] = None,
+    ) -> bool:
+        """휴식 조건(무대 수 r, 최소 휴식 초) 만족 여부. starts는 start_times 결과(없으면 생성)"""
+        if min_rest_seconds > 0 and starts is None:
+            starts = self.start_times(order)
+        adj, n, degree = self.adjacency, len(self.names), self.degree
+        for i, s in enumerate(order):
+            if not degree[s]:
+                continue
+            # 뒤로 훑으며 무대 수(r) 또는 시간 기준 창 안의 무대와 충돌(참가자 공유)하면 위반
+            row = s * n
+            j = i - 1
+            while j >= 0 and ((i - j) <= r_rest or
+                              (min_rest_seconds > 0 and starts[i] - starts[j] < min_rest_seconds)):
+                if adj[row + order[j]]:
+                    return False
+                j -= 1
+        return True
+
+    def start_times(self, order: Sequence[int]) -> List[int]:
+        """누적 시작시간(초). starts[i]=i번 슬롯 시작, starts[n]=총 길이"""
+        durs = self.durations
+        starts = [0] * (len(order) + 1)
+        t = 0
+        for i, s in enumerate(order):
+            starts[i] = t
+            t += durs[s]
+        starts[len(order)] = t
+        return starts
+
+
+def compile_problem(rows: List[Dict]) -> Problem:
+    """rows(name/duration/performers/fixed) → Problem. 고정 위치가 범위 밖이거나 겹치면 ValueError"""
+    n = len(rows)
+    names: List[str] = []
+    index: Dict[str, int] = {}
+    durations = array("l")
+    performers: List[str] = []
+    perf_index: Dict[str, int] = {}
+    perf_ids: List[Tuple[int, ...]] = []
+    perf_masks: List[int] = []
+    board = [-1] * n
+    free: List[int] = []
+
+    for s, x in enumerate(rows):
+        names.append(x["name"])
+        index[x["name"]] = s
+        durations.append(int(x["duration"]))
+
+        ids: List[int] = []
+        mask = 0
+        for p in x["performers"]:
+            pid = perf_index.get(p)
+            if pid is None:
+                pid = perf_index[p] = len(performers)
+                performers.append(p)
+            if not (mask >> pid) & 1:
+                ids.append(pid)
+                mask |= 1 << pid
+        perf_ids.append(tuple(ids))
+        perf_masks.append(mask)
+
+        fx = x.get("fixed")
+        if fx is None:
+            free.append(s)
+            continue
+        pos = fx - 1
+        if pos < 0 or pos >= n or board[pos] >= 0:
+            raise ValueError(f"고정 배치 오류: 무대={x['name']}, 위치={fx}")
+        board[pos] = s
+
+    # 참가자별 출연 무대 마스크 → 무대별 충돌 마스크/인접 행렬
+    by_perf = [0] * len(performers)
+    for s, ids in enumerate(perf_ids):
+        for p in ids:
+            by_perf[p] |= 1 << s
+    conflicts: List[int] = []
+    adjacency = bytearray(n * n)
+    degree: List[int] = []
+    for s, ids in enumerate(perf_ids):
+        m = 0
+        for p in ids:
+            m |= by_perf[p]
+        m &= ~(1 << s)
+        conflicts.append(m)
+        degree.append(popcount(m))
+        row = s * n
+        while m:
+            low = m & -m
+            adjacency[row + low.bit_length() - 1] = 1
+            m ^= low
+
+    return Problem(names, index, durations, performers, perf_ids, perf_masks, board, free,
+                   conflicts, adjacency, degree)
@@ -0,0 +1,130 @@
+# timetable/relax.py - 최소 위반 탐색(완화 단계)
+# ------------------------------------------------
+# - 휴식 조건을 다 만족할 수 없을 때, 위반이 가장 적은 스케줄을 찾는다
+# - 위반 = 참가자별 연속 등장 쌍 중 r칸 안(무대 수 위반) / 휴식 초 미만(시간 위반)
+#   (연속 등장만 봐도 됨: 창 안의 먼 쌍이 있으면 그 사이 연속 쌍도 창 안)
+#   → 위반 0 ⇔ Problem.feasible
+# - 벌점 = 무대 수 위반 × VIOL_WEIGHT_WINDOW + 시간 위반 × VIOL_WEIGHT_SECONDS
+# - 탐색: 무작위 채우기에서 시작, swap/move 이웃을 담금질로 수락(반복 횟수 예산, seed로 재현)
+#   시간으로 끊지 않음 → seed마다 결과가 정해짐(직렬/프로세스 풀 동일). 마감은 호출 측이 seed 단위로
+
+from typing import List, Tuple, Sequence
+import math
+import random
+
+from .problem import Problem
+
+VIOL_WEIGHT_WINDOW = 2   # 무대 수(r) 위반 가중치
+VIOL_WEIGHT_SECONDS = 1  # 최소 휴식 초 위반 가중치
+
+
+def _rotate(cur: List[int], slots: List[int], a: int, b: int) -> None:
+    """slots[a]의 무대를 slots[b]로 옮기고 사이 무대는 한 칸씩 당김/밂"""
+    v = cur[slots[a]]
+    if a < b:
+        for k in range(a, b):
+            cur[slots[k]] = cur[slots[k + 1]]
+    else:
+        for k in range(a, b, -1):
+            cur[slots[k]] = cur[slots[k - 1]]
+    cur[slots[b]] = v
+
+
+def violation_counts(
+    problem: Problem,
+    order: Sequence[int],
+    r_rest: int,
+    min_rest_seconds: int,
+) -> Tuple[int, int]:
+    """(무대 수 위반 수, 시간 위반 수) - 참가자별 연속 등장 쌍 기준"""
+    durs = problem.durations
+    last_slot = [-1] * len(problem.performers)
+    last_start = [0] * len(problem.performers)
+    window = seconds = 0
+    t = 0
+    for i, s in enumerate(order):
+        for p in problem.perf_ids[s]:
+            j = last_slot[p]
+            if j >= 0:
+                if i - j <= r_rest:
+                    window += 1
+                elif t - last_start[p] < min_rest_seconds:
+                    seconds += 1
+            last_slot[p] = i
+            last_start[p] = t
+        t += durs[s]
+    return window, seconds
+
+
+def violating_performers(
+    problem: Problem,
+    order: Sequence[int],
+    r_rest: int,
+    min_rest_seconds: int,
+) -> List[int]:
+    """위반한 연속 등장 쌍마다 그 참가자 id (violation_counts와 같은 기준, 중복 포함)"""
+    durs = problem.durations
+    last_slot = [-1] * len(problem.performers)
+    last_start = [0] * len(problem.performers)
+    out: List[int] = []
+    t = 0
+    for i, s in enumerate(order):
+        for p in problem.perf_ids[s]:
+            j = last_slot[p]
+            if j >= 0 and (i - j <= r_rest or t - last_start[p] < min_rest_seconds):
+                out.append(p)
+            last_slot[p] = i
+            last_start[p] = t
+        t += durs[s]
+    return out
+
+
+def violation_penalty(problem: Problem, order: Sequence[int], r_rest: int, min_rest_seconds: int) -> int:
+    """가중 위반 벌점(0이면 휴식 조건 만족)"""
+    window, seconds = violation_counts(problem, order, r_rest, min_rest_seconds)
+    return window * VIOL_WEIGHT_WINDOW + seconds * VIOL_WEIGHT_SECONDS
+
+
+def min_violation(
+    problem: Problem,
+    order: Sequence[int],
+    r_rest: int,
+    min_rest_seconds: int,
+    max_iters: int,
+    seed: int = 0,
+    t_start: float = 1.0,
+    t_end: float = 0.05,
+) -> Tuple[List[int], int]:
+    """order에서 시작해 벌점이 가장 낮았던 스케줄과 그 벌점 반환(벌점 0이면 일찍 종료)"""
+    cur = list(order)
+    cur_pen = violation_penalty(problem, cur, r_rest, min_rest_seconds)
+    best, best_pen = cur[:], cur_pen
+    slots = [i for i, s in enumerate(problem.board) if s < 0]
+    m = len(slots)
+    if m < 2 or max_iters <= 0:
+        return best, best_pen
+
+    rnd = random.Random(seed)
+    for it in range(max_iters):
+        if best_pen == 0:
+            break
+        temp = t_start * (t_end / t_start) ** (it / max_iters)
+        a, b = rnd.sample(range(m), 2)
+        swap = rnd.random() < 0.5
+        if swap:
+            i, j = slots[a], slots[b]
+            cur[i], cur[j] = cur[j], cur[i]
+        else:
+            _rotate(cur, slots, a, b)
+
+        pen = violation_penalty(problem, cur, r_rest, min_rest_seconds)
+        delta = pen - cur_pen
+        if delta <= 0 or rnd.random() < math.exp(-delta / temp):
+            cur_pen = pen
+            if cur_pen < best_pen:
+                best, best_pen = cur[:], cur_pen
+        elif swap:
+            cur[i], cur[j] = cur[j], cur[i]
+        else:
+            _rotate(cur, slots, b, a)
+    return best, best_pen
@@ -0,0 +1,204 @@
+# timetable/scoring.py - 채점 함수 + 증분(delta) 채점
+# ------------------------------------------------
+# - app 점수(낮을수록 좋음): 총 길이 + 근접 재등장 약한 패널티
+# - v3 점수(높을수록 좋음): 참가자 분산도(근접 재등장 감점/충분히 띄우면 보너스)
+#                          + 무대 길이 균형(긴 무대 연속 감점/긴·짧은 번갈음 보너스)
+# - 두 점수 모두 "참가자별 연속 등장 간격 항 + 인접 슬롯 쌍 항"의 합(정수)
+# - 순위 키(rank_key, 낮을수록 좋음): (근접 재등장 단위, -v3 점수)
+#   총 길이는 순서와 무관 → app 점수 순서 = 단위 순서, 같으면(r ≥ 2면 늘 0) v3 점수로 가름
+#   → DeltaScorer는 swap/move로 바뀐 위치 주변 쌍과 해당 참가자의 등장 목록만 다시 계산
+
+from bisect import bisect_left
+from typing import List, Dict, Sequence, Tuple
+
+from .problem import Problem, popcount
+
+# 파라미터(쉽게 조절 가능)
+NEAR_REPEAT_WINDOW = 2   # 이 창 안에 같은 참가자 재등장 → 감점
+PENALTY_NEAR_REPEAT = 2  # 가까운 재등장 감점 크기
+PENALTY_LONG_LONG = 2    # 긴 무대끼리 연속 감점
+LONG_THRESHOLD = 200
+
+BONUS_SPREAD = 1         # 충분히 띄워졌을 때 소보너스
+BONUS_ALT_LS = 1         # 긴/짧은 번갈음 보너스
+
+
+def v3_score(problem: Problem, order: Sequence[int]) -> int:
+    """scheduler_v3_scoring의 점수(무대 id 순서)"""
+    score = 0
+
+    # 1) 참가자 분산도
+    last_seen = [-1] * len(problem.performers)
+    for i, s in enumerate(order):
+        for p in problem.perf_ids[s]:
+            if last_seen[p] >= 0:
+                dist = i - last_seen[p]
+                if dist <= NEAR_REPEAT_WINDOW:
+                    score -= PENALTY_NEAR_REPEAT * (NEAR_REPEAT_WINDOW + 1 - dist)
+                elif dist >= NEAR_REPEAT_WINDOW + 2:
+                    score += BONUS_SPREAD
+            last_seen[p] = i
+
+    # 2) 무대 길이 균형
+    durs = problem.durations
+    for i in range(1, len(order)):
+        prev_long = durs[order[i - 1]] >= LONG_THRESHOLD
+        cur_long = durs[order[i]] >= LONG_THRESHOLD
+        if prev_long and cur_long:
+            score -= PENALTY_LONG_LONG
+        if prev_long != cur_long:
+            score += BONUS_ALT_LS
+
+    return score
+
+
+def near_repeat_units(problem: Problem, order: Sequence[int]) -> int:
+    """app 점수의 근접 재등장 패널티(0.1점 단위): 참가자별 연속 등장 거리 1 → 2, 거리 2 → 1"""
+    masks = problem.perf_masks
+    units = 0
+    for i in range(1, len(order)):
+        m = masks[order[i]]
+        prev1 = masks[order[i - 1]]
+        units += 2 * popcount(m & prev1)
+        if i >= 2:
+            # 직전(i-1)에도 나온 참가자는 거리 1로 이미 셌으므로 제외
+            units += popcount(m & masks[order[i - 2]] & ~prev1)
+    return units
+
+
+def app_score(problem: Problem, order: Sequence[int]) -> float:
+    """app 점수(낮을수록 좋음): 총 길이 + 근접 재등장 약한 패널티(거리 1: 0.2, 거리 2: 0.1 /인)"""
+    durs = problem.durations
+    return sum(durs[s] for s in order) + near_repeat_units(problem, order) * 0.1
+
+
+def rank_key(problem: Problem, order: Sequence[int]) -> Tuple[int, int]:
+    """후보 순위 키(낮을수록 좋음): (근접 재등장 단위, -v3 점수)"""
+    return near_repeat_units(problem, order), -v3_score(problem, order)
+
+
+# ========================= 증분 채점 =========================
+class DeltaScorer:
+    """현재 스케줄을 들고 있다가 일부 슬롯을 바꿨을 때의 점수 변화만 계산.
+    value = Σ(참가자별 연속 등장 간격 d의 gap[d]) + Σ(인접 슬롯 쌍 pair[긴?][긴?])"""
+
+    def __init__(self, problem: Problem, order: Sequence[int], gap: List[int], pair: List[List[int]]):
+        n = len(order)
+        self.problem = problem
+        self.order = list(order)
+        self.gap = gap + [gap[-1]] * max(0, n + 1 - len(gap))  # 거리 n까지 조회 가능하게
+        self.pair = pair
+        self.cls = [1 if d >= LONG_THRESHOLD else 0 for d in problem.durations]
+        self.positions: List[List[int]] = [[] for _ in problem.performers]
+        for i, s in enumerate(self.order):
+            for p in problem.perf_ids[s]:
+                self.positions[p].append(i)
+        self.value = sum(self._gaps(pos) for pos in self.positions)
+        self.value += sum(self._pair(self.order[i - 1], self.order[i]) for i in range(1, n))
+
+    def _gaps(self, pos: List[int]) -> int:
+        g = self.gap
+        return sum(g[b - a] for a, b in zip(pos, pos[1:]))
+
+    def _pair(self, a: int, b: int) -> int:
+        return self.pair[self.cls[a]][self.cls[b]]
+
+    def _new_positions(self, changes: Dict[int, int]) -> Dict[int, List[int]]:
+        """바뀌는 참가자 → 변경 후 등장 위치(정렬)"""
+        order, perf_ids = self.order, self.problem.perf_ids
+        removed: Dict[int, List[int]] = {}
+        added: Dict[int, List[int]] = {}
+        for i, s in changes.items():
+            old = perf_ids[order[i]]
+            new = perf_ids[s]
+            for p in old:
+                if p not in new:
+                    removed.setdefault(p, []).append(i)
+            for p in new:
+                if p not in old:
+                    added.setdefault(p, []).append(i)
+        out: Dict[int, List[int]] = {}
+        for p in set(removed) | set(added):
+            pos = self.positions[p][:]
+            for i in removed.get(p, ()):
+                del pos[bisect_left(pos, i)]
+            for i in added.get(p, ()):
+                pos.insert(bisect_left(pos, i), i)
+            out[p] = pos
+        return out
+
+    def _pair_keys(self, changes: Dict[int, int]) -> List[int]:
+        n = len(self.order)
+        keys = set()
+        for i in changes:
+            if i > 0:
+                keys.add(i)      # 쌍 (i-1, i)
+            if i + 1 < n:
+                keys.add(i + 1)  # 쌍 (i, i+1)
+        return list(keys)
+
+    def delta(self, changes: Dict[int, int]) -> int:
+        """changes(슬롯 → 새 무대 id)를 적용했을 때의 value 변화"""
+        order = self.order
+        d = 0
+        for p, pos in self._new_positions(changes).items():
+            d += self._gaps(pos) - self._gaps(self.positions[p])
+        for k in self._pair_keys(changes):
+            d -= self._pair(order[k - 1], order[k])
+            d += self._pair(changes.get(k - 1, order[k - 1]), changes.get(k, order[k]))
+        return d
+
+    def apply(self, changes: Dict[int, int]) -> int:
+        """changes 적용 후 변화량 반환"""
+        d = self.delta(changes)
+        for p, pos in self._new_positions(changes).items():
+            self.positions[p] = pos
+        for i, s in changes.items():
+            self.order[i] = s
+        self.value += d
+        return d
+
+    # --- 이웃 이동 헬퍼 ---
+    def swap_changes(self, i: int, j: int) -> Dict[int, int]:
+        order = self.order
+        return {i: order[j], j: order[i]}
+
+    def move_changes(self, slots: List[int], a: int, b: int) -> Dict[int, int]:
+        """slots[a]의 무대를 slots[b]로 옮기고 사이(slots 기준)는 한 칸씩 밀기"""
+        order = self.order
+        ch: Dict[int, int] = {slots[b]: order[slots[a]]}
+        if a < b:
+            for k in range(a, b):
+                ch[slots[k]] = order[slots[k + 1]]
+        else:
+            for k in range(a, b, -1):
+                ch[slots[k]] = order[slots[k - 1]]
+        return ch
+
+
+def v3_gap_table(n: int) -> List[int]:
+    """v3 참가자 분산도의 거리별 점수"""
+    table = [0] * (n + 1)
+    for d in range(1, n + 1):
+        if d <= NEAR_REPEAT_WINDOW:
+            table[d] = -PENALTY_NEAR_REPEAT * (NEAR_REPEAT_WINDOW + 1 - d)
+        elif d >= NEAR_REPEAT_WINDOW + 2:
+            table[d] = BONUS_SPREAD
+    return table
+
+
+def v3_scorer(problem: Problem, order: Sequence[int]) -> DeltaScorer:
+    """value == v3_score(problem, order)"""
+    pair = [[0, BONUS_ALT_LS], [BONUS_ALT_LS, -PENALTY_LONG_LONG]]
+    return DeltaScorer(problem, order, v3_gap_table(len(order)), pair)
+
+
+def app_scorer(problem: Problem, order: Sequence[int]) -> DeltaScorer:
+    """value == near_repeat_units(problem, order), 점수는 app_score_of로"""
+    return DeltaScorer(problem, order, [0, 2, 1, 0], [[0, 0], [0, 0]])
+
+
+def app_score_of(scorer: DeltaScorer) -> float:
+    """app_scorer의 현재 value → app_score와 같은 값"""
+    durs = scorer.problem.durations
+    return sum(durs[s] for s in scorer.order) + scorer.value * 0.1
@@ -0,0 +1,291 @@
+# timetable/solver.py - 제약 전파 백트래킹 엔진
+# ------------------------------------------------
+# - 변수: 슬롯, 값: 무대 (각 무대는 한 번만 사용)
+# - 슬롯별 도메인(아직 가능한 무대 집합)을 int 비트마스크로 유지
+# - 무대 배치 시 전방 검사: 같은 무대 제거 + 앞뒤 r칸에서 참가자 겹치는 무대 제거
+# - 분기: 도메인이 가장 작은 슬롯부터(MRV), 값은 충돌이 많은 무대부터
+#   빈 도메인/갈 곳 없는 무대가 생기면 즉시 되돌림
+# - 한 갈래에 오래 갇히지 않도록 노드 한도를 1.5배씩 늘려가며 재시작
+# - 시간 기준(최소 휴식 초)은 미배치 칸을 최대 길이로 가정해도 모자라면 즉시 가지치기,
+#   완성된 스케줄은 정확히 재검사
+# - counts(dict)를 주면 nodes/restarts/prune_window/prune_seconds를 더해 줌(진단용)
+# - deadline(time.time() 기준 절대 시각)을 주면 256노드마다 확인, 지나면 실패로 끝냄
+# - solve_many: 첫 해에서 멈추지 않고 탐색을 이어가 서로 다른 해 k개를 한 번에 모음
+#   (공통 앞부분 탐색을 공유 → seed마다 처음부터 다시 풀고 중복을 버리는 낭비 제거)
+#   · 해를 찾으면 마지막 backjump단계의 결정을 되돌려 다른 갈래로 넘어감(다양성)
+#   · 이미 모은 해와 min_diff칸 미만으로 다르면 버림
+#   · 같은 트리의 서로 다른 잎은 갈라진 슬롯에서 무대가 다르므로 늘 서로 다름
+
+from typing import List, Dict, Tuple, Optional
+import random
+import time
+
+from .problem import Problem, popcount
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+class _PastDeadline(Exception):
+    pass
+
+
+def _bits(mask: int) -> List[int]:
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+def solve(
+    problem: Problem,
+    r_rest: int,
+    min_rest_seconds: int = 0,
+    seed: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    counts: Optional[Dict[str, int]] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[bool, Optional[List[int]]]:
+    """휴식 조건을 만족하는 스케줄(무대 id 순서) 하나 찾기.
+    seed=None이면 입력 순서대로 시도(재현용), max_nodes나 deadline을 넘기면 (False, None)"""
+    found = _run(problem, r_rest, min_rest_seconds, seed, max_nodes, counts, deadline, 1, 2, 0)
+    return (True, found[0]) if found else (False, None)
+
+
+def solve_many(
+    problem: Problem,
+    r_rest: int,
+    min_rest_seconds: int = 0,
+    k: int = 5,
+    seed: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    min_diff: int = 2,
+    backjump: Optional[int] = None,
+    counts: Optional[Dict[str, int]] = None,
+    deadline: Optional[float] = None,
+) -> List[List[int]]:
+    """휴식 조건을 만족하는 서로 다른 스케줄을 한 번의 탐색에서 최대 k개 (찾은 순서).
+    서로 min_diff칸 이상 다른 해만 모음, backjump=None이면 빈 칸 수의 1/4.
+    max_nodes/deadline에 걸리면 그때까지 모은 해만 반환"""
+    if k < 1:
+        raise ValueError("k는 1 이상이어야 합니다.")
+    if backjump is None:
+        backjump = max(1, len(problem.free) // 4)
+    return _run(problem, r_rest, min_rest_seconds, seed, max_nodes, counts, deadline, k, min_diff, backjump)
+
+
+def _run(
+    problem: Problem,
+    r_rest: int,
+    min_rest_seconds: int,
+    seed: Optional[int],
+    max_nodes: Optional[int],
+    counts: Optional[Dict[str, int]],
+    deadline: Optional[float],
+    k: int,
+    min_diff: int,
+    backjump: int,
+) -> List[List[int]]:
+    """카운터 합산/마감 처리 공통부"""
+    tally = {"nodes": 0, "restarts": 0, "prune_window": 0, "prune_seconds": 0}
+    found: List[List[int]] = []
+    try:
+        _search(problem, r_rest, min_rest_seconds, seed, max_nodes, tally, deadline, found, k, min_diff, backjump)
+    except _PastDeadline:
+        pass
+    finally:
+        if counts is not None:
+            for key, v in tally.items():
+                counts[key] = counts.get(key, 0) + v
+    return found
+
+
+def _search(
+    problem: Problem,
+    r_rest: int,
+    min_rest_seconds: int,
+    seed: Optional[int],
+    max_nodes: Optional[int],
+    tally: Dict[str, int],
+    deadline: Optional[float],
+    found: List[List[int]],
+    k: int,
+    min_diff: int,
+    backjump: int,
+) -> None:
+    """해를 found에 k개까지 채움(재시작해도 모은 해는 유지)"""
+    n = len(problem)
+    if n == 0:
+        return
+
+    durs = problem.durations
+    perf_ids = problem.perf_ids
+    conflict = problem.conflicts
+    adj = problem.adjacency
+    degree = problem.degree
+
+    slots: List[int] = problem.board[:]
+    free_mask = 0
+    for s in problem.free:
+        free_mask |= 1 << s
+
+    free_durs = [durs[s] for s in problem.free]
+    max_dur = max(free_durs) if free_durs else 0
+    rnd = random.Random(seed) if seed is not None else None
+    nodes = [0]
+    limit = [0]
+
+    def time_ok(i: int, s: int) -> bool:
+        """간격 상한(미배치 칸=최대 길이)조차 부족하면 False"""
+        # 왼쪽: 이전 등장 시작 ~ 현재 시작 (이전 무대 길이 포함)
+        gap = 0
+        for k in range(i - 1, -1, -1):
+            t = slots[k]
+            gap += durs[t] if t >= 0 else max_dur
+            if gap >= min_rest_seconds:
+                break
+            if t >= 0 and adj[s * n + t]:
+                return False
+        # 오른쪽: 현재 시작 ~ 다음 등장 시작 (현재 무대 길이 포함)
+        gap = durs[s]
+        for k in range(i + 1, n):
+            if gap >= min_rest_seconds:
+                break
+            t = slots[k]
+            if t >= 0 and adj[s * n + t]:
+                return False
+            gap += durs[t] if t >= 0 else max_dur
+        return True
+
+    def full_time_ok() -> bool:
+        last_start = [-1] * len(problem.performers)
+        t = 0
+        for s in slots:
+            for p in perf_ids[s]:
+                if last_start[p] >= 0 and t - last_start[p] < min_rest_seconds:
+                    return False
+                last_start[p] = t
+            t += durs[s]
+        return True
+
+    def assign(domains: List[int], i: int, s: int) -> Optional[Tuple[List[int], int]]:
+        """슬롯 i에 무대 s 배치 후 전방 검사. (새 도메인, 남은 도메인 합집합), 모순이면 None"""
+        new = domains[:]
+        new[i] = 0
+        bit = 1 << s
+        block = conflict[s]
+        lo, hi = i - r_rest, i + r_rest
+        union = 0
+        for j in range(n):
+            d = new[j]
+            if slots[j] >= 0 or j == i:
+                continue
+            d &= ~bit
+            if lo <= j <= hi:
+                d &= ~block
+            if not d:
+                return None
+            new[j] = d
+            union |= d
+        return new, union
+
+    # 초기 도메인: 빈 슬롯 = 모든 비고정 무대, 고정 무대 주변은 가지치기
+    domains = [0 if slots[i] >= 0 else free_mask for i in range(n)]
+    for i in range(n):
+        s = slots[i]
+        if s < 0:
+            continue
+        lo, hi = max(0, i - r_rest), min(n - 1, i + r_rest)
+        for j in range(lo, hi + 1):
+            t = slots[j]
+            if j == i:
+                continue
+            if t >= 0:
+                if adj[s * n + t]:
+                    return
+            else:
+                domains[j] &= ~conflict[s]
+        if min_rest_seconds > 0 and not time_ok(i, s):
+            return
+    if any(slots[i] < 0 and not domains[i] for i in range(n)):
+        return
+
+    jump = [0]  # 해를 찾은 뒤 되돌릴 남은 단계 수
+
+    def backtrack(domains: List[int], unplaced: int) -> bool:
+        """True = k개를 채워 그만"""
+        if not unplaced:
+            if min_rest_seconds > 0 and not full_time_ok():
+                tally["prune_seconds"] += 1
+                return False
+            if all(sum(a != b for a, b in zip(slots, f)) >= min_diff for f in found):
+                found.append(slots[:])
+                jump[0] = backjump
+            return len(found) >= k
+        nodes[0] += 1
+        tally["nodes"] += 1
+        if nodes[0] > limit[0]:
+            raise _OutOfBudget()
+        if deadline is not None and not tally["nodes"] & 255 and time.time() > deadline:
+            raise _PastDeadline()
+
+        # MRV: 남은 후보가 가장 적은 슬롯
+        best, best_cnt = -1, n + 1
+        for j in range(n):
+            if slots[j] >= 0:
+                continue
+            c = popcount(domains[j])
+            if c < best_cnt:
+                best, best_cnt = j, c
+                if c == 1:
+                    break
+
+        values = _bits(domains[best])
+        if rnd is not None:
+            rnd.shuffle(values)
+        values.sort(key=lambda v: -degree[v])  # 안정 정렬: 같은 차수끼리는 섞인 순서 유지
+        for s in values:
+            if min_rest_seconds > 0 and not time_ok(best, s):
+                tally["prune_seconds"] += 1
+                continue
+            res = assign(domains, best, s)
+            if res is None:
+                tally["prune_window"] += 1
+                continue
+            new, union = res
+            # 아직 안 쓴 무대가 어느 슬롯에도 들어갈 수 없으면 실패
+            left = unplaced & ~(1 << s)
+            if left & ~union:
+                tally["prune_window"] += 1
+                continue
+            slots[best] = s
+            if backtrack(new, left):
+                return True
+            slots[best] = -1
+            if jump[0]:
+                jump[0] -= 1
+                return False
+        return False
+
+    fixed_slots = slots[:]
+    used = 0
+    step = 2 * n
+    while True:
+        limit[0] = step if max_nodes is None else min(step, max_nodes - used)
+        nodes[0] = 0
+        jump[0] = 0
+        try:
+            backtrack(domains, free_mask)
+            return  # 한도 안에서 끝까지 탐색 = k개를 채웠거나 더 찾을 해가 없음(k=1이면 해 없음 증명)
+        except _OutOfBudget:
+            used += limit[0]
+            if max_nodes is not None and used >= max_nodes:
+                return
+            slots[:] = fixed_slots
+            tally["restarts"] += 1
+            step = step * 3 // 2
+            if rnd is None:
+                rnd = random.Random(0)
@@ -0,0 +1,78 @@
+# timetable/stats.py - 후보안 생성 진단 카운터
+# ------------------------------------------------
+# - PhaseStats: 단계(강제/완화)별 시도·성공·중복·배치 샘플·탐색 노드·가지치기/탈락 이유·시간
+# - GenStats: 두 단계 + 사전 검사/정확해 결과 + 위반 원인 참가자 집계
+# - to_dict/to_json으로 UI·로그에 그대로 사용 (프로세스 풀 워커는 dict 카운터를 돌려주고 merge)
+# - stop: 단계가 멈춘 이유(STOP_*)
+# - Progress: 1차(강제) 진행 중 UI로 넘기는 중간 상태(훑은 수, 현재 상위 후보)
+
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+import json
+
+from .candidate import Candidate
+
+STOP_ENOUGH = "enough"         # 요청한 개수를 채움
+STOP_DEADLINE = "deadline"     # 제한 시간(벽시계 안전장치)
+STOP_SATURATED = "saturated"   # 남은 작업량에 새 후보가 나올 가망이 낮음(조기 중단)
+STOP_EXHAUSTED = "exhausted"   # 작업량 예산(강제)/정해진 seed(완화)를 다 씀
+
+
+@dataclass
+class PhaseStats:
+    attempts: int = 0        # 엔진 탐색 시도(seed) 수
+    solved: int = 0          # 해를 돌려준 시도 수
+    duplicates: int = 0      # 이미 모은 후보와 같은 해
+    batch_samples: int = 0   # 배치 샘플링으로 본 순열 수
+    batch_valid: int = 0     # 그중 조건 만족
+    examined: int = 0        # 채점한 서로 다른 유효 스케줄 수(강제)
+    reject_window: int = 0   # 배치 탈락: r칸 안 재등장
+    reject_seconds: int = 0  # 배치 탈락: 휴식 초 부족
+    nodes: int = 0           # 제약 전파 탐색 노드
+    restarts: int = 0        # 재시작 횟수
+    prune_window: int = 0    # 가지치기: r칸 전방 검사 실패
+    prune_seconds: int = 0   # 가지치기: 휴식 초 부족
+    seconds: float = 0.0     # 단계 소요 시간
+    stop: str = ""           # 멈춘 이유(STOP_*), 실행 안 했으면 ""
+
+    def merge(self, counts: Dict[str, int]) -> None:
+        """solver/batch가 채운 dict 카운터를 더함"""
+        for k, v in counts.items():
+            setattr(self, k, getattr(self, k) + v)
+
+
+@dataclass
+class Progress:
+    examined: int             # 지금까지 채점한 서로 다른 유효 스케줄 수
+    kept: int                 # 유지 중인 상위 후보 수
+    best: List[Candidate]     # 현재 상위 후보(좋은 순)
+    seconds: float            # 1차 경과 시간
+    time_limit: float         # 1차 제한 시간
+
+
+@dataclass
+class GenStats:
+    strict: PhaseStats = field(default_factory=PhaseStats)
+    relaxed: PhaseStats = field(default_factory=PhaseStats)
+    infeasible_reasons: List[str] = field(default_factory=list)
+    exact_status: Optional[str] = None
+    exact_seconds: float = 0.0
+    performers: Dict[str, int] = field(default_factory=dict)  # 위반 원인 참가자 → 횟수(배치 탈락/완화 후보 표본 추정)
+    time_limit: float = 0.0
+    total_seconds: float = 0.0
+
+    def phase(self, enforce_rest: bool) -> PhaseStats:
+        return self.strict if enforce_rest else self.relaxed
+
+    def add_performers(self, names: List[str]) -> None:
+        for p in names:
+            self.performers[p] = self.performers.get(p, 0) + 1
+
+    def top_performers(self, k: int = 10) -> List[tuple]:
+        return sorted(self.performers.items(), key=lambda x: (-x[1], x[0]))[:k]
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, sort_keys=True)
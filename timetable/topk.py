@@ -0,0 +1,53 @@
+# timetable/topk.py - 상위 K개 후보 유지(크기 제한 힙)
+# ------------------------------------------------
+# - 키가 낮을수록 좋음(튜플 키 가능). 힙에는 K개만 두므로 표본이 수천 개여도 메모리는 K에 비례
+# - 힙 루트 = 현재 K개 중 가장 나쁜 후보 → 새 후보는 루트와 한 번 비교해 넣거나 버림(O(log K))
+# - 같은 키면 먼저 들어온 후보 우선(같은 입력이면 같은 결과)
+# - 중복 검사는 힙 안의 후보끼리만: 밀려난 후보가 다시 와도 키가 같고 순번이 늦어 다시 밀림
+# - 후보는 해시 가능한 값이면 무엇이든(보통 Candidate)
+
+from typing import Hashable, List, Tuple
+import heapq
+
+
+class TopK:
+    """키가 낮은 순으로 최대 k개의 서로 다른 후보 보관"""
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("k는 1 이상이어야 합니다.")
+        self.k = k
+        self._heap: List[tuple] = []  # (음수 키, -순번, 후보) → 루트가 가장 나쁜 후보
+        self._members = set()
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, key: Tuple[int, ...], cand: Hashable) -> bool:
+        """넣었으면 True (이미 있거나 K개보다 나쁘면 False)"""
+        if cand in self._members:
+            return False
+        item = (tuple(-x for x in key), -self._seq, cand)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+            self._members.add(cand)
+            return True
+        if item[:2] <= self._heap[0][:2]:
+            return False
+        old = heapq.heapreplace(self._heap, item)
+        self._members.discard(old[2])
+        self._members.add(cand)
+        return True
+
+    def worst_key(self) -> Tuple[int, ...]:
+        """현재 K개 중 가장 나쁜 키(비어 있으면 ValueError)"""
+        if not self._heap:
+            raise ValueError("비어 있습니다.")
+        return tuple(-x for x in self._heap[0][0])
+
+    def items(self) -> List[Tuple[Tuple[int, ...], Hashable]]:
+        """(키, 후보) 좋은 순"""
+        ranked = sorted(self._heap, key=lambda x: x[:2], reverse=True)
+        return [(tuple(-x for x in neg), cand) for neg, _, cand in ranked]
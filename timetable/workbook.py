@@ -0,0 +1,153 @@
+# timetable/workbook.py - 라인업 엑셀 읽기/결과 저장 (Streamlit 없이 import 가능)
+# ------------------------------------------------
+# - 입력: '무대' 시트(이름/길이(초)/참가자/고정순서, 영문 name/duration/performers/fixed도 허용)
+#   + 선택 '옵션' 시트. 옵션 시트는 두 형식을 모두 읽음
+#   · 앱 템플릿: 옵션/값 (최소휴식무대, 후보안개수, 최소휴식초)
+#   · make_template.py 템플릿: 옵션명/값 (최소휴식슬롯, 후보안개수, 쉬는시간(초))
+#   옵션 시트가 없거나 읽을 수 없으면 DEFAULT_OPTIONS(앱/CLI 기준, 예전 스크립트는 defaults로 자기 기본값)
+# - 무대 정규화/검증은 ingest.validate_stages(열 단위, 오류를 모아서 한 번에)
+# - 읽기는 openpyxl 읽기 전용 모드로 '무대'/'옵션' 시트만 훑음(빈 행도 남겨 오류 행 번호 = 엑셀 행 번호)
+#   (이전 결과 시트가 수십 개 쌓인 파일도 그 시트들은 읽지 않음)
+# - read_lineup_bytes: 업로드 바이트의 sha256 → 파싱 결과 LRU(PARSE_CACHE_ENTRIES개, 이 모듈 전용 OrderedDict)
+#   Streamlit은 클릭할 때마다 스크립트를 다시 돌리므로 같은 파일은 한 번만 파싱
+# - 결과: 입력 파일은 그대로 두고 별도 파일(또는 버퍼)에 후보안마다 시트 하나(슬롯/무대/길이(초)/참가자)
+#   openpyxl 쓰기 전용 모드로 한 번에 씀(행을 바로 흘려보냄 → 후보안 수 × 무대 수가 커도 메모리 일정,
+#   입력 파일의 이전 결과 시트를 다시 읽고 쓰지 않음), summary=True면 맨 앞에 '요약' 시트
+# - app.py와 CLI(python -m timetable)가 같은 함수를 사용
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+import hashlib
+import io
+import threading
+
+import pandas as pd
+
+from .ingest import validate_stages
+
+DEFAULT_OPTIONS = {"r_rest": 2, "num_candidates": 5, "min_rest_seconds": 0}
+# 옵션 키 → 엑셀 옵션 이름(앞쪽 우선)
+OPTION_NAMES = {
+    "r_rest": ("최소휴식무대", "최소휴식슬롯"),
+    "num_candidates": ("후보안개수",),
+    "min_rest_seconds": ("최소휴식초", "쉬는시간(초)"),
+}
+PARSE_CACHE_ENTRIES = 16  # 파싱 결과를 기억할 업로드 파일 수
+RESULT_COLUMNS = ["슬롯", "무대", "길이(초)", "참가자"]
+SUMMARY_SHEET = "요약"
+
+_parse_cache: "OrderedDict[str, Any]" = OrderedDict()  # sha256 → (rows, options) 또는 읽기 오류
+_parse_lock = threading.Lock()  # Streamlit 세션마다 스레드가 달라서
+
+
+def normalize_rows_from_df(df: pd.DataFrame) -> List[Dict]:
+    """DataFrame → 내부 rows 포맷으로 정규화 (오류가 있으면 전부 담은 ValueError)"""
+    report = validate_stages(df)
+    report.raise_if_errors()
+    return report.rows
+
+
+def read_options(opt_df: pd.DataFrame, defaults: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """옵션 시트 → {r_rest, num_candidates, min_rest_seconds} (없는 값은 defaults, 없으면 DEFAULT_OPTIONS)"""
+    key_col = "옵션" if "옵션" in opt_df.columns else "옵션명"
+    raw = dict(zip(opt_df[key_col].astype(str).str.strip(), opt_df["값"]))
+    out = dict(DEFAULT_OPTIONS if defaults is None else defaults)
+    for key, names in OPTION_NAMES.items():
+        for name in names:
+            if name in raw and pd.notna(raw[name]):
+                out[key] = int(raw[name])
+                break
+    return out
+
+
+def _sheet_df(ws) -> pd.DataFrame:
+    """읽기 전용 시트 → DataFrame(첫 행이 열 이름).
+    중간의 빈 행도 남겨 DataFrame 위치 = 엑셀 행 - 2를 유지(오류 행 번호용), 끝의 빈 행만 버림"""
+    it = ws.iter_rows(values_only=True)
+    header = next(it, None)
+    if header is None:
+        return pd.DataFrame()
+    columns = [f"Unnamed: {i}" if h is None else h for i, h in enumerate(header)]
+    records = list(it)
+    while records and all(v is None for v in records[-1]):
+        records.pop()
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def read_lineup(src: Any, defaults: Optional[Dict[str, int]] = None) -> Tuple[List[Dict], Dict[str, int]]:
+    """엑셀(경로 또는 파일 객체)에서 무대 rows와 옵션 읽기(옵션 기본값은 read_options와 같음)"""
+    import openpyxl  # 읽을 때만(openpyxl은 import 시 PIL까지 불러옴 → CLI import를 가볍게)
+
+    wb = openpyxl.load_workbook(src, read_only=True, data_only=True)
+    try:
+        if "무대" not in wb.sheetnames:
+            raise ValueError("'무대' 시트가 없습니다.")
+        stage_df = _sheet_df(wb["무대"])
+        try:
+            options = read_options(_sheet_df(wb["옵션"]), defaults)
+        except Exception:
+            options = dict(DEFAULT_OPTIONS if defaults is None else defaults)
+    finally:
+        wb.close()
+    return normalize_rows_from_df(stage_df), options
+
+
+def read_lineup_bytes(data: bytes) -> Tuple[List[Dict], Dict[str, int]]:
+    """업로드 바이트 → read_lineup 결과. 같은 내용이면 캐시(오류도 그대로 다시 냄)"""
+    key = hashlib.sha256(data).hexdigest()
+    with _parse_lock:
+        hit = _parse_cache.get(key)
+        if hit is not None:
+            _parse_cache.move_to_end(key)
+    if hit is None:
+        try:
+            hit = read_lineup(io.BytesIO(data))
+        except Exception as e:
+            hit = ValueError(str(e))
+        with _parse_lock:
+            _parse_cache[key] = hit
+            while len(_parse_cache) > PARSE_CACHE_ENTRIES:
+                _parse_cache.popitem(last=False)
+    if isinstance(hit, Exception):
+        raise hit
+    rows, options = hit
+    # 캐시 항목을 호출한 쪽에서 고쳐도 다음 결과가 바뀌지 않게 복사본
+    return [dict(x, performers=list(x["performers"])) for x in rows], dict(options)
+
+
+def phase_notes(count: int, strict_count: int, optimal_count: int) -> List[Dict]:
+    """후보안별 요약 시트 '구분' 열(최적/만족/완화)"""
+    return [{"구분": "최적" if i < optimal_count else "만족" if i < strict_count else "완화"}
+            for i in range(count)]
+
+
+def write_results(
+    dest: Any,
+    rows: List[Dict],
+    schedules: List[Sequence[str]],
+    sheet_prefix: str = "후보안",
+    summary: bool = False,
+    notes: Optional[List[Dict]] = None,
+) -> None:
+    """후보안마다 시트 하나(sheet_prefix_1, _2, ...)로 새 엑셀 파일(경로 또는 파일 객체)에 저장.
+    summary=True면 '요약' 시트(시트/무대 수/총 길이(초) + 후보안별 notes 열)를 맨 앞에"""
+    import openpyxl  # 쓸 때만(read_lineup과 같은 이유)
+
+    if notes is not None and len(notes) != len(schedules):
+        raise ValueError("notes는 후보안마다 하나씩이어야 합니다.")
+    info = {x["name"]: (x["duration"], ", ".join(x["performers"])) for x in rows}
+    wb = openpyxl.Workbook(write_only=True)
+    if summary or not schedules:  # 시트가 하나도 없으면 저장할 수 없음
+        ws = wb.create_sheet(SUMMARY_SHEET)
+        extra = list(dict.fromkeys(k for note in (notes or []) for k in note))
+        ws.append(["시트", "무대 수", "총 길이(초)"] + extra)
+        for idx, sched in enumerate(schedules, start=1):
+            note = notes[idx - 1] if notes else {}
+            ws.append([f"{sheet_prefix}_{idx}", len(sched), sum(info[s][0] for s in sched)]
+                      + [note.get(k) for k in extra])
+    for idx, sched in enumerate(schedules, start=1):
+        ws = wb.create_sheet(f"{sheet_prefix}_{idx}")
+        ws.append(RESULT_COLUMNS)
+        for slot, s in enumerate(sched, start=1):
+            ws.append([slot, s, *info[s]])
+    wb.save(dest)